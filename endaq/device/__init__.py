@@ -6,11 +6,14 @@ data-logging devices.
 __author__ = "David Stokes"
 __copyright__ = "Copyright 2024 Mide Technology Corporation"
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import os
 from pathlib import Path
-import string
-from threading import RLock
-from typing import Dict, List, Optional, Union
+import re
+from threading import Lock, RLock
+from time import time
+from typing import AnyStr, Dict, List, NamedTuple, Optional, Union
 from weakref import WeakValueDictionary
 
 import logging
@@ -28,6 +31,8 @@ from .endaq import EndaqS, EndaqW
 from .response_codes import DeviceStatusCode
 from .slamstick import SlamStickX, SlamStickC, SlamStickS
 from .types import Drive, Filename, Epoch
+from . import devinfo
+from . import util
 
 # ============================================================================
 #
@@ -48,16 +53,29 @@ __all__ = ('CommandError', 'ConfigError', 'ConfigVersionError',
 
 SCHEMA_PATH = "{endaq.device}/schemata"
 
+
+def _addSchemaPath(path: str, after: Optional[str] = None):
+    """ Add a path to the `ebmlite` schema search path, if it isn't already
+        present. Used internally.
+
+        :param path: The schema path to add.
+        :param after: An existing schema path, after which to insert the
+            new one. Defaults to the start of the search path.
+    """
+    schemaPaths = ebmlite.core.SCHEMA_PATH
+    if path in schemaPaths:
+        return
+    idx = schemaPaths.index(after) + 1 if after else 0
+    schemaPaths.insert(idx, path)
+
+
 # Ensure the `idelib` schemata are in the schema path (for idelib <= 3.2.4)
-if "{idelib}/schemata" not in ebmlite.core.SCHEMA_PATH:
-    ebmlite.core.SCHEMA_PATH.insert(0, "{idelib}/schemata")
+_addSchemaPath("{idelib}/schemata")
 
 # Add this package's schema to `ebmlite` schema search path, after
 # `idelib`'s. This is a workaround for issue with legacy schema installed by
 # earlier versions (can probably be removed after beta).
-if SCHEMA_PATH not in ebmlite.core.SCHEMA_PATH:
-    _idx = ebmlite.core.SCHEMA_PATH.index("{idelib}/schemata") + 1
-    ebmlite.core.SCHEMA_PATH.insert(_idx, SCHEMA_PATH)
+_addSchemaPath(SCHEMA_PATH, after="{idelib}/schemata")
 
 # ============================================================================
 #
@@ -67,18 +85,29 @@ if SCHEMA_PATH not in ebmlite.core.SCHEMA_PATH:
 # put the ones with more general `isRecorder()` methods (i.e. superclasses)
 # after the more specific ones. `SlamStickC` is first, since it is now sold
 # as Sx-D16 but has the old SlamStick hardware, but the naming convention
-# matches that of `EndaqS`. The base `Recorder` should be last.
-RECORDER_TYPES = [SlamStickC, EndaqS, EndaqW, SlamStickS, SlamStickX, Recorder]
+# matches that of `EndaqS`. The base `Recorder` should be last. A tuple, so
+# it can be shared without copying; to add types, replace it with a new one.
+RECORDER_TYPES = (SlamStickC, EndaqS, EndaqW, SlamStickS, SlamStickX, Recorder)
 
 # Cache of previously seen recorders, to prevent redundant instantiations.
-# Keyed by the hash of the recorders DEVINFO (or equivalent).
-RECORDERS = {}
+# Keyed by the hash of the recorders DEVINFO (or equivalent). Recorders are
+# removed automatically once nothing else references them.
+RECORDERS = WeakValueDictionary()
 
 # Another cache of recorders, keyed by serial number. Used when discovering
 # remote devices that don't immediately have DEVINFO accessible.
 RECORDERS_BY_SN = WeakValueDictionary()
 
-# Max number of cached recorders. Probably not needed, but just in case.
+# Another cache of recorders, keyed by chip ID (for devices that have one).
+RECORDERS_BY_CHIPID = WeakValueDictionary()
+
+# The most recently used recorders, keyed like `RECORDERS`. Keeps them alive
+# (and in `RECORDERS`) even if the caller doesn't keep a reference, so
+# polling with `getDevices()` doesn't create new instances every time.
+# Ordered from least to most recently used.
+_RECENT_RECORDERS = OrderedDict()
+
+# Max number of recently used recorders to keep alive.
 RECORDER_CACHE_SIZE = 100
 
 # Lock to prevent contention (primarily with the recorder cache). Several
@@ -86,10 +115,269 @@ RECORDER_CACHE_SIZE = 100
 _module_busy = RLock()
 
 
+class _Probe(NamedTuple):
+    """ The results of examining a possible recorder's filesystem, shared by
+        the checks of all `RECORDER_TYPES`. Used internally.
+    """
+    path: Filename  # The path, as a `Drive` if the filesystem was checked
+    info: bytes     # The raw contents of the DEVINFO file
+    name: Optional[str]  # The product name in the DEVINFO, if any
+
+
+# Cache of previous filesystem probes, keyed by path and `strict`, with the
+# DEVINFO contents each was made from. Whether the DEVINFO needs rereading
+# is decided only by `devinfo._readInfoFile()`; an entry is reused if that
+# returns the same contents.
+_PROBE_CACHE = OrderedDict()
+_probe_busy = Lock()
+
+# Recorder root directories previously found by `onRecorder()`, keyed by the
+# real path and `strict`. Ordered from least to most recently used.
+_ON_RECORDER_CACHE = OrderedDict()
+_ON_RECORDER_CACHE_SIZE = 256
+
+# The result of the last `getDeviceList()`, the time it was generated, and
+# the mounted drive state, `strict`, and `RECORDER_TYPES` it was generated
+# with. Reused if none of those have changed within `DEVICE_LIST_TTL`.
+_LAST_DEVICE_LIST = (None, 0, ())
+
+# Max age (in seconds) of a reused `getDeviceList()` result. Limits how long
+# a recently mounted device that isn't ready to be read is missed.
+DEVICE_LIST_TTL = 2.0
+
+# Max number of threads used to probe several paths concurrently.
+PROBE_THREADS = 8
+
+# The thread pool used to probe paths, and the `PROBE_THREADS` it was
+# created with. Kept between calls to `getDevices()`, rather than created
+# for every poll.
+_PROBE_EXECUTOR = (0, None)
+
+
+def _probePath(path: Filename,
+               strict: bool = True) -> Optional[_Probe]:
+    """ Perform the filesystem checks common to all `RECORDER_TYPES` once,
+        rather than once per type: the filesystem type (if `strict`) and the
+        reading of the DEVINFO file.
+
+        :param path: The filesystem path to check.
+        :param strict: If `True`, non-FAT file systems will be rejected.
+        :return: A `_Probe`, or `None` if the path cannot be a recorder.
+    """
+    try:
+        if isinstance(path, Drive):
+            root, fs = path.path, path.fs
+        else:
+            root, fs = path, ''
+
+        root = util.realpath(root)
+        key = (path, strict)
+
+        info = devinfo._readInfoFile(os.path.join(root, Recorder._INFO_FILE))
+        if info is None:
+            return None
+
+        with _probe_busy:
+            cached = _PROBE_CACHE.get(key)
+            if cached and (cached[0] is info or cached[0] == info):
+                _PROBE_CACHE.move_to_end(key)
+                return cached[1]
+
+        probe = None
+        if strict and not fs:
+            driveInfo = os_specific.getDriveInfo(root)
+            fs = driveInfo.fs if driveInfo else ''
+
+        if not strict or "fat" in (fs or '').lower():
+            if strict and not isinstance(path, Drive):
+                path = Drive(path=root, label=None, sn=None, fs=fs, type=None)
+            probe = _Probe(path, info, Recorder._getProductName(info))
+        elif not fs:
+            # Drive info unavailable (e.g., just mounted); don't remember
+            # the failure, so the path gets checked again next time.
+            return None
+
+        with _probe_busy:
+            _PROBE_CACHE[key] = (info, probe)
+            while len(_PROBE_CACHE) > RECORDER_CACHE_SIZE:
+                _PROBE_CACHE.popitem(last=False)
+
+        return probe
+
+    except (KeyError, TypeError, AttributeError, IOError) as err:
+        logger.debug("_probePath() raised a possibly-allowed exception: %r" % err)
+        return None
+
+
+def _uncacheProbes(root: str):
+    """ Remove the cached probes of a path, so it will be checked again.
+        Used internally.
+
+        :param root: The real path of the recorder's root directory.
+    """
+    with _probe_busy:
+        for key in list(_PROBE_CACHE):
+            path = key[0].path if isinstance(key[0], Drive) else key[0]
+            if util.realpath(path) == root:
+                del _PROBE_CACHE[key]
+
+
+def _getProbeExecutor() -> ThreadPoolExecutor:
+    """ Get the thread pool for probing paths concurrently, creating it if
+        it doesn't exist or `PROBE_THREADS` has changed. Used internally.
+    """
+    global _PROBE_EXECUTOR
+    with _probe_busy:
+        threads, executor = _PROBE_EXECUTOR
+        if executor is None or threads != PROBE_THREADS:
+            if executor is not None:
+                executor.shutdown(wait=False)
+            executor = ThreadPoolExecutor(max_workers=PROBE_THREADS,
+                                          thread_name_prefix='endaq-probe')
+            _PROBE_EXECUTOR = (PROBE_THREADS, executor)
+        return executor
+
+
+def _getRecorderType(probe: _Probe) -> Optional[type]:
+    """ Find the `RECORDER_TYPES` item matching a probed path, by the
+        product name in its DEVINFO (see `_getTypeByName()`). The filesystem
+        checks have already been done by `_probePath()`. Used internally.
+
+        :param probe: The results of `_probePath()`.
+        :return: The matching `Recorder` subclass, or `None`.
+    """
+    return _getTypeByName(probe.name)
+
+
+# A single regex combining the `_NAME_PATTERN` of every item in
+# `RECORDER_TYPES`, and the tuple of types it was built from. The regex is
+# `None` if the patterns can't be combined.
+_NAME_DISPATCH = ((), None)
+
+# Regex flags that can be applied to part of a combined pattern, and their
+# inline (scoped) equivalents.
+_SCOPED_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'),
+                 (re.DOTALL, 's'), (re.ASCII, 'a'))
+
+# Results of `_getTypeByName()`, keyed by product name and the tuple of
+# types, so names seen before don't need to be matched again.
+_NAME_MATCHES = {}
+_NAME_MATCHES_SIZE = 256
+
+
+def _getNameDispatch() -> tuple:
+    """ Get a regex matching the product name of any type in
+        `RECORDER_TYPES`, with a named group for each type (in the same
+        order, so the first type matching a name wins). Rebuilt if the
+        contents of `RECORDER_TYPES` have changed. Used internally.
+
+        :return: A tuple containing the recorder types and the compiled
+            regex. The name of the group matched is the index of the type,
+            prefixed with ``_t``. The regex is `None` if a pattern uses
+            flags that can't be applied to only part of a regex.
+    """
+    global _NAME_DISPATCH
+    types = tuple(RECORDER_TYPES)
+    if _NAME_DISPATCH[0] != types:
+        parts = []
+        for i, t in enumerate(types):
+            # Each pattern's flags are applied to its own group only
+            flags = t._NAME_PATTERN.flags & ~re.UNICODE
+            scoped = ''
+            for flag, letter in _SCOPED_FLAGS:
+                if flags & flag:
+                    scoped += letter
+                    flags &= ~flag
+            if flags:
+                parts = None
+                break
+            pattern = t._NAME_PATTERN.pattern
+            if scoped:
+                pattern = "(?%s:%s)" % (scoped, pattern)
+            parts.append("(?P<_t%d>%s)" % (i, pattern))
+
+        try:
+            dispatch = re.compile("|".join(parts)) if parts is not None else None
+        except re.error:
+            # e.g., a pattern with global inline flags, like "(?i)..."
+            dispatch = None
+        _NAME_DISPATCH = (types, dispatch)
+    return _NAME_DISPATCH
+
+
+def _getTypeByName(name: Optional[AnyStr]) -> Optional[type]:
+    """ Find the first `RECORDER_TYPES` item matching a product name, using
+        a single combined regex. Used internally.
+
+        :param name: The product name (or part number) to match.
+        :return: The matching `Recorder` subclass, or `None`.
+    """
+    if name is None:
+        return None
+    if isinstance(name, bytes):
+        name = str(name, 'utf8')
+
+    types, dispatch = _getNameDispatch()
+    key = (name, types)
+    try:
+        return _NAME_MATCHES[key]
+    except KeyError:
+        pass
+
+    if dispatch is not None:
+        match = dispatch.match(name)
+        rtype = None if match is None else types[int(match.lastgroup[2:])]
+    else:
+        rtype = next((t for t in types if t._matchName(name)), None)
+
+    if len(_NAME_MATCHES) >= _NAME_MATCHES_SIZE:
+        _NAME_MATCHES.clear()
+    _NAME_MATCHES[key] = rtype
+    return rtype
+
+
 # ============================================================================
 # Platform-specific stuff. 
 # ============================================================================
 
+def _cacheRecorder(devhash: int, dev: Recorder):
+    """ Add a recorder to the cache, and mark it as the most recently used.
+        The least recently used recorders beyond `RECORDER_CACHE_SIZE` are
+        no longer kept alive by the cache. Used internally; the caller
+        should hold `_module_busy`.
+
+        :param devhash: The recorder's hash.
+        :param dev: The recorder to cache.
+    """
+    RECORDERS[devhash] = dev
+    _RECENT_RECORDERS[devhash] = dev
+    _RECENT_RECORDERS.move_to_end(devhash)
+    while len(_RECENT_RECORDERS) > RECORDER_CACHE_SIZE:
+        _RECENT_RECORDERS.popitem(last=False)
+
+
+def _uncacheRecorder(devhash: int):
+    """ Remove a recorder from the cache, including the recently used
+        recorders kept alive. Used internally; the caller should hold
+        `_module_busy`.
+
+        :param devhash: The hash the recorder was cached with.
+    """
+    RECORDERS.pop(devhash, None)
+    _RECENT_RECORDERS.pop(devhash, None)
+
+
+def _indexRecorder(dev: Recorder):
+    """ Add a recorder to the caches keyed by serial number and chip ID.
+        Used internally; the caller should hold `_module_busy`.
+
+        :param dev: The recorder to add.
+    """
+    RECORDERS_BY_SN[dev.serialInt] = dev
+    if dev.chipId:
+        RECORDERS_BY_CHIPID[dev.chipId] = dev
+
+
 def getRecorder(path: Filename,
                 update: bool = False,
                 strict: bool = True) -> Union[Recorder, None]:
@@ -105,39 +393,70 @@ def getRecorder(path: Filename,
         :return: An instance of a :class:`~.endaq.device.Recorder` subclass,
             or `None` if the path is not a recorder.
     """
-    global RECORDERS, RECORDERS_BY_SN
+    return _getRecorder(path, _probePath(path, strict), update, strict)
+
+
+def _getRecorder(path: Filename,
+                 probe: Optional[_Probe],
+                 update: bool = False,
+                 strict: bool = True) -> Union[Recorder, None]:
+    """ Get a specific recorder from the results of probing its path. Does
+        the work of `getRecorder()`, so `getDevices()` can reuse probes done
+        concurrently. Used internally.
+
+        :param path: The filesystem path to the recorder's root directory.
+        :param probe: The results of `_probePath()` for `path`.
+        :param update: If `True`, update the path of known devices if they
+            have changed.
+        :param strict: If `True`, non-FAT file systems will be rejected.
+        :return: An instance of a :class:`~.endaq.device.Recorder` subclass,
+            or `None` if the path is not a recorder.
+    """
+    if probe is None:
+        return None
+
+    rtype = _getRecorderType(probe)
+    if rtype is None:
+        return None
 
-    dev = None
+    devhash = rtype._getHash(path, info=probe.info)
+
+    # Fast path: a known recorder, with nothing in the caches to change
+    # other than its recency. The dictionary operations are atomic, so the
+    # lock is not required.
+    dev = RECORDERS.get(devhash, None) if devhash else None
+    if (dev is not None
+            and devhash in _RECENT_RECORDERS
+            and not (update and dev.path != path)
+            and RECORDERS_BY_SN.get(dev.serialInt) is dev):
+        try:
+            _RECENT_RECORDERS.move_to_end(devhash)
+            # Clear DEVINFO-getter, in case device was previously remote
+            dev._devinfo = None
+            return dev
+        except KeyError:
+            # Removed by another thread in the meantime; use the slow path.
+            pass
 
     with _module_busy:
-        for rtype in RECORDER_TYPES:
-            if rtype.isRecorder(path, strict=strict):
-                # Get existing recorder if it has already been instantiated.
-                devhash = rtype._getHash(path)
-                dev = RECORDERS.pop(devhash, None)
-                if not dev:
-                    dev = rtype(path, strict=strict)
-                else:
-                    # Clear DEVINFO-getter, in case device was previously remote
-                    dev._devinfo = None
-
-                if devhash:
-                    RECORDERS[devhash] = dev
-
-                    # Path has changed. Note that the hash does not include
-                    # path, in case a device rebooted and remounted with a
-                    # different mount point/drive letter.
-                    if update and dev.path != path:
-                        dev.path = path
-
-                RECORDERS_BY_SN[dev.serialInt] = dev
+        # Get existing recorder if it has already been instantiated.
+        dev = RECORDERS.get(devhash, None)
+        if not dev:
+            dev = rtype(path, strict=strict, devinfo=probe.info)
+        else:
+            # Clear DEVINFO-getter, in case device was previously remote
+            dev._devinfo = None
 
-                break
+        if devhash:
+            _cacheRecorder(devhash, dev)
 
-        # Remove old cached devices. Ordered dictionaries assumed!
-        if len(RECORDERS) > RECORDER_CACHE_SIZE:
-            for k in list(RECORDERS.keys())[-RECORDER_CACHE_SIZE:]:
-                del RECORDERS[k]
+            # Path has changed. Note that the hash does not include
+            # path, in case a device rebooted and remounted with a
+            # different mount point/drive letter.
+            if update and dev.path != path:
+                dev.path = path
+
+        _indexRecorder(dev)
 
         return dev
 
@@ -154,7 +473,17 @@ def deviceChanged(recordersOnly: bool = True,
         :param clear: If `True`, clear the cache of previously-detected
             drives and devices.
     """
-    return os_specific.deviceChanged(recordersOnly, RECORDER_TYPES, clear=clear)
+    changed = os_specific.deviceChanged(recordersOnly, RECORDER_TYPES, clear=clear)
+    if changed or clear:
+        util.realpath.cache_clear()
+        with _probe_busy:
+            _PROBE_CACHE.clear()
+            _ON_RECORDER_CACHE.clear()
+            _clearDeviceList()
+        devinfo._DEVINFO_CACHE.clear()
+        if clear:
+            _SERIAL_FAILURES.clear()
+    return changed
 
 
 def getDeviceList(strict: bool = True) -> List[Drive]:
@@ -167,7 +496,23 @@ def getDeviceList(strict: bool = True) -> List[Drive]:
         :return: A list of `Drive` objects (named tuples containing the
             drive path, label, and other low-level filesystem info).
     """
-    return os_specific.getDeviceList(RECORDER_TYPES, strict=strict)
+    global _LAST_DEVICE_LIST
+
+    key = (os_specific.getMountState(), strict, RECORDER_TYPES)
+    lastKey, lastTime, lastResult = _LAST_DEVICE_LIST
+    if key == lastKey and time() - lastTime < DEVICE_LIST_TTL:
+        return list(lastResult)
+
+    result = os_specific.getDeviceList(RECORDER_TYPES, strict=strict)
+    _LAST_DEVICE_LIST = (key, time(), tuple(result))
+    return result
+
+
+def _clearDeviceList():
+    """ Clear the cached result of `getDeviceList()`. Used internally.
+    """
+    global _LAST_DEVICE_LIST
+    _LAST_DEVICE_LIST = (None, 0, ())
 
 
 def getDevices(paths: Optional[List[Filename]] = None,
@@ -190,32 +535,39 @@ def getDevices(paths: Optional[List[Filename]] = None,
             non-removable media will be automatically rejected.
         :return: A list of instances of `Recorder` subclasses.
     """
-    global RECORDERS, RECORDERS_BY_SN
-
-    with _module_busy:
-        if paths is None:
-            paths = getDeviceList(strict=strict)
-        else:
-            if isinstance(paths, (str, bytes, bytearray, Path)):
-                paths = [paths]
-
-        result = set()
-
-        for path in paths:
-            dev = getRecorder(path, update=update, strict=strict)
-            if dev is not None:
-                result.add(dev)
-
-        if unmounted:
-            for dev in getSerialDevices(known=RECORDERS_BY_SN):
-                if not dev.available:
-                    dev.path = None
-                result.add(dev)
-                RECORDERS.pop(hash(dev), None)
-                RECORDERS[hash(dev)] = dev
-                RECORDERS_BY_SN[dev.serialInt] = dev
-
-        return sorted(result, key=lambda x: x.path or '\uffff')
+    if paths is None:
+        paths = getDeviceList(strict=strict)
+    else:
+        if isinstance(paths, (str, bytes, bytearray, Path)):
+            paths = [paths]
+
+    result = set()
+
+    # Do the filesystem checks of all paths concurrently, then get the
+    # recorders from the results. Duplicate paths are removed (keeping
+    # their order). A `bytearray` isn't hashable, so it's made `bytes`.
+    paths = list(dict.fromkeys(bytes(p) if isinstance(p, bytearray) else p
+                               for p in paths))
+    if len(paths) > 1 and PROBE_THREADS > 1:
+        probes = list(_getProbeExecutor().map(lambda p: _probePath(p, strict), paths))
+    else:
+        probes = [_probePath(p, strict) for p in paths]
+
+    for path, probe in zip(paths, probes):
+        dev = _getRecorder(path, probe, update=update, strict=strict)
+        if dev is not None:
+            result.add(dev)
+
+    if unmounted:
+        for dev in getSerialDevices(known=RECORDERS_BY_SN):
+            if not dev.available:
+                dev.path = None
+            result.add(dev)
+            with _module_busy:
+                _cacheRecorder(hash(dev), dev)
+                _indexRecorder(dev)
+
+    return sorted(result, key=lambda x: x.path or '\uffff')
 
 
 def findDevice(sn: Optional[Union[str, int]] = None,
@@ -252,28 +604,33 @@ def findDevice(sn: Optional[Union[str, int]] = None,
             representing the device with the specified serial number or chip
             ID, or `None` if it cannot be found.
     """
-    with _module_busy:
-        if sn and chipId:
-            raise ValueError('Either a serial number or chip ID is required, not both')
-        elif sn is None and chipId is None:
-            raise ValueError('Either a serial number or chip ID is required')
-
-        if isinstance(sn, str):
-            sn = sn.lstrip(string.ascii_letters+"0")
-            if not sn:
-                sn = 0
-            sn = int(sn)
-
-        if isinstance(chipId, str):
-            chipId = int(chipId, 16)
-
-        for d in getDevices(paths, update=update, strict=strict, unmounted=unmounted):
-            if sn is not None and d.serialInt == sn:
-                return d
-            elif chipId is not None and d.chipId == chipId:
-                return d
+    if sn and chipId:
+        raise ValueError('Either a serial number or chip ID is required, not both')
+    elif sn is None and chipId is None:
+        raise ValueError('Either a serial number or chip ID is required')
 
-        return None
+    if isinstance(sn, str):
+        sn = util.parseSerialNumber(sn)
+
+    if isinstance(chipId, str):
+        chipId = int(chipId, 16)
+
+    # Fast path: a known, mounted device can be returned without searching.
+    if paths is None and not update:
+        if sn is not None:
+            d = RECORDERS_BY_SN.get(sn)
+        else:
+            d = RECORDERS_BY_CHIPID.get(chipId)
+        if d is not None and (d.strict or not strict) and d.available:
+            return d
+
+    for d in getDevices(paths, update=update, strict=strict, unmounted=unmounted):
+        if sn is not None and d.serialInt == sn:
+            return d
+        elif chipId is not None and d.chipId == chipId:
+            return d
+
+    return None
 
 
 # ============================================================================
@@ -289,12 +646,33 @@ def isRecorder(path: Filename,
             is used to identify a recorder. If `True`, non-FAT file systems
             will be automatically rejected.
     """
-    with _module_busy:
-        for t in RECORDER_TYPES:
-            if t.isRecorder(path, strict=strict):
-                return True
+    probe = _probePath(path, strict)
+    if probe is None:
         return False
 
+    return _getRecorderType(probe) is not None
+
+
+def _getMountPoint(path: str) -> Optional[str]:
+    """ Get the root of the volume containing a path: the drive on Windows,
+        or the mount point on other systems. Used internally.
+
+        :param path: A 'real' absolute path (i.e., from `os.path.realpath()`).
+        :return: The volume's root directory, or `None` if it could not be
+            determined.
+    """
+    drive = os.path.splitdrive(path)[0]
+    if drive:
+        return drive + os.sep
+
+    oldp = None
+    while path != oldp:
+        if os.path.ismount(path):
+            return path
+        oldp = path
+        path = os.path.dirname(path)
+    return None
+
 
 def onRecorder(path: Filename, strict: bool = True) -> bool:
     """ Returns the root directory of a recorder from a path to a directory or
@@ -313,13 +691,44 @@ def onRecorder(path: Filename, strict: bool = True) -> bool:
             device, `False` if not.
     """
     oldp = None
-    path = os.path.realpath(path)
+    path = util.realpath(path)
+    key = (path, strict)
+
+    # Previously found roots are only reused if they are still recorders.
+    with _probe_busy:
+        root = _ON_RECORDER_CACHE.get(key)
+    if root:
+        if isRecorder(root, strict=strict):
+            with _probe_busy:
+                if key in _ON_RECORDER_CACHE:
+                    _ON_RECORDER_CACHE.move_to_end(key)
+            return root
+        with _probe_busy:
+            _ON_RECORDER_CACHE.pop(key, None)
+
+    root = False
+    if strict:
+        # A 'strict' recorder is always the root of a volume, so only the
+        # mount point (or drive) containing the path needs to be checked.
+        mountpoint = _getMountPoint(path)
+        if mountpoint:
+            root = mountpoint if isRecorder(mountpoint, strict=strict) else False
+            oldp = path
+
     while path != oldp:
         if isRecorder(path, strict=strict):
-            return path
+            root = path
+            break
         oldp = path
         path = os.path.dirname(path)
-    return False
+
+    if root:
+        with _probe_busy:
+            _ON_RECORDER_CACHE[key] = root
+            while len(_ON_RECORDER_CACHE) > _ON_RECORDER_CACHE_SIZE:
+                _ON_RECORDER_CACHE.popitem(last=False)
+
+    return root
 
 
 def fromRecording(doc: Dataset) -> Recorder:
@@ -336,11 +745,7 @@ def fromRecording(doc: Dataset) -> Recorder:
     if productName is None:
         raise TypeError("Could not create virtual recorder from file "
                         "(no ProductName or PartNumber in metadata)")
-    recType = None
-    for rec in RECORDER_TYPES:
-        if rec._matchName(productName):
-            recType = rec
-            break
+    recType = _getTypeByName(productName)
     if recType is None:
         return None
     return recType.fromRecording(doc)
@@ -350,6 +755,56 @@ def fromRecording(doc: Dataset) -> Recorder:
 # 
 # ============================================================================
 
+# Placeholder recorders (with serial command interfaces) used to retrieve
+# the DEVINFO of possible recorders. Created when needed and reused; each is
+# used by only one thread at a time.
+_SERIAL_PROBES = []
+_serial_probes_busy = Lock()
+
+# Times of recent failures to get DEVINFO via serial, keyed by port and serial
+# number. Those devices aren't queried again for `SERIAL_RETRY_DELAY` seconds.
+_SERIAL_FAILURES = {}
+
+# Time (in seconds) to wait before re-querying a device that failed to
+# provide its DEVINFO via serial.
+SERIAL_RETRY_DELAY = 5.0
+
+
+def _getSerialInfo(sn: int) -> Optional[bytes]:
+    """ Retrieve a possible recorder's DEVINFO via its serial command
+        interface, using one of the placeholder recorders in
+        `_SERIAL_PROBES`. Used internally.
+
+        :param sn: The serial number of the possible recorder.
+        :return: The raw DEVINFO, or `None` if the device did not provide
+            it.
+    """
+    with _serial_probes_busy:
+        fake = _SERIAL_PROBES.pop() if _SERIAL_PROBES else None
+    if fake is None:
+        # Dummy recorder and command interface to retrieve DEVINFO
+        fake = Recorder(None)
+        fake.command = SerialCommandInterface(fake)
+
+    fake.command.port = None
+    fake._snInt, fake._sn = sn, str(sn)
+
+    try:
+        logger.debug(f'Getting info for SN {sn} via serial')
+        return fake.command._getInfo(0, index=False) or None
+    except CommandError as err:
+        if err.errno != DeviceStatusCode.ERR_INVALID_COMMAND:
+            logger.debug(f'Unexpected {type(err).__name__} getting info for {sn}: {err}')
+        return None
+    finally:
+        # Don't keep the port open (or referenced) between uses
+        fake.command.close()
+        fake.command.port = None
+        with _serial_probes_busy:
+            if len(_SERIAL_PROBES) < PROBE_THREADS:
+                _SERIAL_PROBES.append(fake)
+
+
 def getSerialDevices(known: Optional[Dict[int, Recorder]] = None,
                      strict: bool = True) -> List[Recorder]:
     """ Find all recorders with a serial command interface (and firmware
@@ -365,36 +820,41 @@ def getSerialDevices(known: Optional[Dict[int, Recorder]] = None,
         known = {}
 
     devices = []
+    unknown = []
 
-    # Dummy recorder and command interface to retrieve DEVINFO
-    fake = Recorder(None)
-    fake.command = SerialCommandInterface(fake)
+    # Forget failures old enough to retry
+    now = time()
+    for key, then in list(_SERIAL_FAILURES.items()):
+        if now - then >= SERIAL_RETRY_DELAY:
+            _SERIAL_FAILURES.pop(key, None)
 
     for port, sn in SerialCommandInterface._possibleRecorders(strict=strict):
-        if sn in known:
-            devices.append(known[sn])
+        dev = known.get(sn)
+        if dev is not None:
+            devices.append(dev)
+        elif (port, sn) not in _SERIAL_FAILURES:
+            unknown.append((port, sn))
+
+    # Query the unknown devices concurrently; each waits on its serial port.
+    sns = [sn for _port, sn in unknown]
+    if len(sns) > 1 and PROBE_THREADS > 1:
+        infos = list(_getProbeExecutor().map(_getSerialInfo, sns))
+    else:
+        infos = [_getSerialInfo(sn) for sn in sns]
+
+    for (port, sn), info in zip(unknown, infos):
+        if not info:
+            logger.debug(f'No info returned by SN {sn}, continuing')
+            _SERIAL_FAILURES[port, sn] = time()
             continue
 
-        fake.command.port = None
-        fake._snInt, fake._sn = sn, str(sn)
-
-        with _module_busy:
-            try:
-                logger.debug(f'Getting info for SN {sn} via serial')
-                info = fake.command._getInfo(0, index=False)
-                if not info:
-                    logger.debug(f'No info returned by SN {sn}, continuing')
-                    continue
-                for devtype in RECORDER_TYPES:
-                    if devtype._isRecorder(info):
-                        device = devtype(None, devinfo=info)
-                        device.command = SerialCommandInterface(device)
-                        device._devinfo = SerialDeviceInfo(device)
-                        devices.append(device)
-                        break
-            except CommandError as err:
-                if err.errno != DeviceStatusCode.ERR_INVALID_COMMAND:
-                    logger.debug(f'Unexpected {type(err).__name__} getting info for {sn}: {err}')
-                continue
+        devtype = _getTypeByName(Recorder._getProductName(info))
+        if devtype is None:
+            continue
+
+        device = devtype(None, devinfo=info)
+        device.command = SerialCommandInterface(device)
+        device._devinfo = SerialDeviceInfo(device)
+        devices.append(device)
 
     return devices
@@ -8,7 +8,10 @@ __author__ = "dstokes"
 from collections import defaultdict
 from datetime import datetime, timedelta
 import errno
+from functools import lru_cache
+from itertools import chain
 import logging
+from operator import attrgetter
 import os
 from pathlib import Path
 import re
@@ -43,6 +46,7 @@ from . import command_interfaces
 from .command_interfaces import CommandInterface
 from .exceptions import *
 from .types import Drive, Filename, Epoch
+from . import util
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +54,96 @@ logger = logging.getLogger(__name__)
 __all__ = ('Recorder', 'os_specific')
 
 
+# ===============================================================================
+#
+# ===============================================================================
+
+@lru_cache(maxsize=None)
+def _loadSchema(name: str) -> ebmlite.core.Schema:
+    """ Get an EBML schema by filename. ebmlite caches loaded schemata, but
+        this also skips its path handling, which is most of the cost of
+        getting a previously loaded schema. Loaded when first used, not
+        on import. Used internally.
+
+        :param name: The schema's XML filename (e.g., ``"mide_ide.xml"``).
+        :return: The loaded `Schema`.
+    """
+    return loadSchema(name)
+
+
+@lru_cache(maxsize=128)
+def _parseDevinfo(info: bytes) -> Dict[str, Any]:
+    """ Parse raw device metadata into a dictionary of `RecorderInfo`
+        items. The results are cached, since the same ``DEVINFO`` gets
+        parsed repeatedly when scanning for devices. Used internally.
+
+        :param info: Raw device metadata, as read from a ``DEVINFO``
+            file, retrieved via a command interface, etc.
+        :return: A dictionary of device information. It is shared by
+            all callers, and must not be modified.
+    """
+    doc = _loadSchema('mide_ide.xml').loads(info)
+    try:
+        props = doc.dump().get('RecordingProperties', {})
+        recInfo = props.get('RecorderInfo', {})
+        for k, v in recInfo.items():
+            if isinstance(v, bytes):
+                # Nothing in the device info should be binary, but as of
+                # ebmlite 3.0.1, StringElements are read as bytes. Convert.
+                recInfo[k] = str(v, 'utf8')
+        return recInfo
+    finally:
+        doc.close()
+
+
+def _bomSuffix(bom: int) -> str:
+    """ Generate the BOM version suffix of a hardware version string
+        (0: none, 1-25: B-Z, 26 and up: AA, BB, etc.).
+    """
+    if bom == 0:
+        return ""
+    elif bom < 26:
+        return chr(bom + 65)
+    return chr((bom % 25) + 64) * int(bom // 25 + 1)
+
+
+# All possible hardware version BOM suffixes, indexed by BOM number.
+_BOM_SUFFIXES = tuple(_bomSuffix(bom) for bom in range(100))
+
+
+class _DeviceFile:
+    """ The full path of a file on a recorder, computed from the recorder's
+        path on first access and then stored as an instance attribute. The
+        `Recorder.path` setter removes the stored values. Used internally.
+    """
+
+    def __init__(self, attr: str):
+        """ The full path of a file on a recorder.
+
+            :param attr: The name of the class attribute containing the
+                file's path, relative to the recorder's root directory.
+        """
+        self.attr = attr
+        self.name = None
+
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+
+    def __get__(self, instance, owner=None) -> Optional[str]:
+        if instance is None:
+            return self
+        # Only reached if the value isn't stored. The lock keeps a value for
+        # an old path being stored after the `path` setter removed it.
+        with instance._busy:
+            path = instance._path
+            if path is not None:
+                path = os.path.join(path, getattr(instance, self.attr))
+            instance.__dict__[self.name] = path
+            return path
+
+
 # ===============================================================================
 #
 # ===============================================================================
@@ -81,6 +175,17 @@ class Recorder:
     _USERPAGE_UPDATE_FILE = os.path.join("SYSTEM", 'userpage.bin')
     _ESP_UPDATE_FILE = os.path.join('SYSTEM', 'esp32.bin')
 
+    # Full paths of files on the device, computed when first used
+    configFile = _DeviceFile('_CONFIG_FILE')
+    infoFile = _DeviceFile('_INFO_FILE')
+    clockFile = _DeviceFile('_CLOCK_FILE')
+    userCalFile = _DeviceFile('_USERCAL_FILE')
+    configUIFile = _DeviceFile('_CONFIG_UI_FILE')
+    recpropFile = _DeviceFile('_RECPROP_FILE')
+    commandFile = _DeviceFile('_COMMAND_FILE')
+    _DEVICE_FILES = ('configFile', 'infoFile', 'clockFile', 'userCalFile',
+                     'configUIFile', 'recpropFile', 'commandFile')
+
     # These should eventually be read from the device
     SN_FORMAT = "%d"
     manufacturer = None
@@ -91,6 +196,14 @@ class Recorder:
 
     _NAME_PATTERN = re.compile(r'')
 
+    # Measurement ranges of digital accelerometers, used by `getAccelRange()`
+    # instead of their parsers' ranges. Checked in order; the first model
+    # found in a sensor's name is used.
+    _ADXL_RANGES = {'ADXL345': (-16, 16),
+                    'ADXL355': (-8, 8),
+                    'ADXL357': (-40, 40),
+                    'ADXL375': (-200, 200)}
+
 
     def __init__(self,
                  path: Optional[Filename],
@@ -121,11 +234,14 @@ class Recorder:
 
         self._virtual: bool = virtual
         self._command: Optional[CommandInterface] = None
+        self._clockCommand: Optional[CommandInterface] = None
         self._config: Optional[ConfigInterface] = None
         self._path: Optional[Filename] = None
         self._devinfo: Optional[DeviceInfo] = None
-        self._rawinfo: Optional[bytes] = devinfo
+        # Immutable `bytes`, so `hash()` is computed once and cached
+        self._rawinfo: Optional[bytes] = bytes(devinfo) if devinfo else devinfo
         self._info: Optional[Dict] = None
+        self._generation = 0  # Incremented by `refresh()`
 
         self._hash: Optional[int] = None
         self._configData: Optional[Dict] = None
@@ -134,21 +250,28 @@ class Recorder:
         self._chipId: Optional[int] = None
         self._sensors: Optional[Dict[int, Sensor]] = None
         self._channels: Optional[Dict[int, Channel]] = None
+        self._allSubchannels: Optional[Tuple[Dict[int, Channel], Tuple[SubChannel, ...]]] = None
+        self._channelsByMtype: Optional[Tuple[Dict[int, Channel], Dict[str, Dict[int, Channel]]]] = None
         self._channelRanges = {}
         self._propData: Optional[bytes] = None
+        self._propDoc: Optional[Tuple[bytes, ebmlite.Document]] = None
         self._manifest: Optional[Dict[str, Any]] = None
         self._calibration: Optional[Dict[str, Any]] = None
         self._calData: Optional[bytes] = None
         self._calPolys: Optional[Dict[int, Any]] = None
         self._userCalPolys: Optional[Dict] = None
         self._userCalDict: Optional[Dict] = None
+        self._userCalDoc: Optional[Tuple[bytes, MasterElement]] = None
         self._factoryCalPolys: Optional[Dict] = None
         self._factoryCalDict: Optional[Dict] = None
         self._properties: Optional[Dict] = None
         self._volumeName: Optional[str] = None
         self._wifi: Optional[str] = None  # Cached name of the manifest's Wi-Fi element
 
-        self.refresh(force=False)
+        # Everything `refresh()` would clear was initialized above; only the
+        # info of virtual devices (which `refresh()` re-reads) needs loading.
+        if virtual:
+            self.getInfo()
         self.path = path
 
         # The source IDE `Dataset` used for 'virtual' devices.
@@ -187,6 +310,11 @@ class Recorder:
         if self.isVirtual:
             raise UnsupportedFeature("Virtual devices cannot execute commands")
 
+        # Fast path: interface already found. Only finding it needs the lock.
+        interface = self._command
+        if interface is not None:
+            return interface
+
         with self._busy:
             if self._command is None:
                 for interface in command_interfaces.INTERFACES:
@@ -235,21 +363,21 @@ class Recorder:
         if self.isVirtual or not self.path:
             return False
 
-        # Two checks, since former is a property that sets latter
-        # and path itself isn't a reliable test in Linux
-        if (os.path.exists(self.path) and os.path.isfile(self.infoFile)):
+        # The DEVINFO file is checked, since the path itself isn't a reliable
+        # test in Linux. Reading it is a single `stat()` if it's unchanged.
+        try:
+            info = devinfo._readInfoFile(self.infoFile)
+            if info is None:
+                return False
             # See if the device is mounted in the same place and is unchanged.
-            try:
-                return self._getHash(self.path) == hash(self)
-            except IOError as err:
-                if err.errno == errno.EINVAL:
-                    # Possible race condition: device dismounts after test.
-                    logger.debug('Ignoring expected IOError (EINVAL) getting hash '
-                                 '(device dismounting?)')
-                    return False
-                raise
-
-        return False
+            return self._getHash(self.path, info=info) == hash(self)
+        except IOError as err:
+            if err.errno == errno.EINVAL:
+                # Possible race condition: device dismounts after test.
+                logger.debug('Ignoring expected IOError (EINVAL) getting hash '
+                             '(device dismounting?)')
+                return False
+            raise
 
 
     def update(self,
@@ -281,7 +409,7 @@ class Recorder:
 
         # Imported here to avoid circular references.
         # I don't like doing this, but I think this case is okay.
-        from . import RECORDERS, findDevice, _module_busy
+        from . import findDevice, _cacheRecorder, _uncacheRecorder, _module_busy
 
         # See if a device with the same chip ID (or serial number for older
         # devices) can be found anywhere. This will also update the paths
@@ -296,8 +424,8 @@ class Recorder:
         if dev and dev != self:
             # Device's DEVINFO has changed, change in place
             with _module_busy:
-                RECORDERS[hash(dev)] = self
-                RECORDERS.pop(hash(self), None)
+                _uncacheRecorder(hash(self))
+                _cacheRecorder(hash(dev), self)
                 self._virtual = False
                 if dev.path != self.path:
                     self.path = dev.path
@@ -331,7 +459,7 @@ class Recorder:
 
             :param path: The device's filesystem path.
             :param info: The contents of the device's `DEVINFO` file, if
-                previously loaded. For future caching optimization.
+                previously loaded, to avoid reading it again.
         """
         if not info:
             info = FileDeviceInfo.readDevinfo(path)
@@ -340,6 +468,11 @@ class Recorder:
 
     def __hash__(self) -> int:
         """ Return hash(self). """
+        # Fast path: hash already computed. Only computing it needs the lock.
+        h = self._hash
+        if h is not None:
+            return h
+
         with self._busy:
             if self._hash is None:
                 self.getInfo()
@@ -353,6 +486,8 @@ class Recorder:
                 rather than use cached data.
         """
         with self._busy:
+            self._generation += 1
+
             # Data derived from DEVINFO
             self._devinfo = None
             self._info = None
@@ -370,18 +505,27 @@ class Recorder:
                 # devices only get a subset of this data upon instantiation
                 if force:
                     self._rawinfo = None
+                    if self._path:
+                        # Imported here to avoid circular references.
+                        from . import _uncacheProbes
+                        devinfo._DEVINFO_CACHE.pop(self.infoFile, None)
+                        _uncacheProbes(self._path)
 
                 self._sensors = None
                 self._channels = None
+                self._allSubchannels = None
+                self._channelsByMtype = None
                 self._channelRanges.clear()
                 self._configData = None
                 self._propData = None
+                self._propDoc = None
                 self._manifest = None
                 self._calibration = None
                 self._calData = None
                 self._calPolys = None
                 self._userCalPolys = None
                 self._userCalDict = None
+                self._userCalDoc = None
                 self._factoryCalPolys = None
                 self._factoryCalDict = None
                 self._properties = None
@@ -397,6 +541,7 @@ class Recorder:
                     logger.debug('Ignoring exception closing {}: '
                                  '{!r}'.format(self._command, err))
                 self._command = None
+            self._clockCommand = None
 
             if self._config:
                 try:
@@ -411,8 +556,8 @@ class Recorder:
     def path(self) -> Union[str, None]:
         """ The recorder's filesystem path (e.g., drive letter or mount point).
         """
-        with self._busy:
-            return self._path
+        # No lock needed; the path is replaced, never modified in place.
+        return self._path
 
 
     @path.setter
@@ -422,11 +567,8 @@ class Recorder:
         with self._busy:
             path = None
             self._volumeName = ''
-            self.configFile = self.infoFile = None
-            self.clockFile = self.userCalFile = self.configUIFile = None
-            self.recpropFile = self.commandFile = None
 
-            if str(newpath).lower().startswith("mqtt"):
+            if util.isMqttPath(newpath):
                 path = None
 
             elif newpath is not None:
@@ -435,17 +577,13 @@ class Recorder:
                     raise IOError("Specified path isn't a %s: %r" %
                                   (self.__class__.__name__, newpath))
 
-                path = os.path.realpath(newpath)
-                self.configFile = os.path.join(path, self._CONFIG_FILE)
-                self.infoFile = os.path.join(path, self._INFO_FILE)
-                self.clockFile = os.path.join(path, self._CLOCK_FILE)
-                self.userCalFile = os.path.join(path, self._USERCAL_FILE)
-                self.configUIFile = os.path.join(path, self._CONFIG_UI_FILE)
-                self.recpropFile = os.path.join(path, self._RECPROP_FILE)
-                self.commandFile = os.path.join(path, self._COMMAND_FILE)
+                path = util.realpath(newpath)
                 self._volumeName = None
 
             self._path = path
+            self._clockCommand = None
+            for name in self._DEVICE_FILES:
+                self.__dict__.pop(name, None)
 
 
     @property
@@ -454,7 +592,7 @@ class Recorder:
         if self.isVirtual or self.isRemote:
             return False
 
-        if self._path and os.path.exists(self._path) and self._volumeName is None:
+        if self._volumeName is None and self._path and os.path.exists(self._path):
             try:
                 self._volumeName = os_specific.getDriveInfo(self.path).label
             except (AttributeError, IOError, TypeError) as err:
@@ -479,7 +617,25 @@ class Recorder:
         """
         if isinstance(name, bytes):
             name = str(name, 'utf8')
-        return bool(cls._NAME_PATTERN.match(name))
+        return cls._NAME_PATTERN.match(name) is not None
+
+
+    @staticmethod
+    def _getProductName(info: bytes) -> Optional[str]:
+        """ Get the product name from raw device metadata. Used internally.
+
+            :param info: Raw device metadata, as read from a ``DEVINFO``
+                file, retrieved via a command interface, etc.
+            :return: The product name, or `None` if the metadata could not
+                be parsed or has no product name.
+        """
+        try:
+            if not info:
+                return None
+            return _parseDevinfo(bytes(info)).get('ProductName')
+        except (KeyError, IOError) as err:
+            logger.debug("_getProductName() raised a possibly-allowed exception: %r" % err)
+            return None
 
 
     @classmethod
@@ -493,19 +649,8 @@ class Recorder:
                 file, retrieved via a command interface, etc.
             :return: `True` if the info is a match for this `Recorder` class.
         """
-        try:
-            if not info:
-                return False
-            devinfo = loadSchema('mide_ide.xml').loads(info).dump()
-            name = devinfo['RecordingProperties']['RecorderInfo']['ProductName']
-            if isinstance(name, bytes):
-                # In ebmlite < 3.1, StringElements are read as bytes.
-                name = str(name, 'utf8')
-
-            return cls._matchName(name)
-        except (KeyError, IOError) as err:
-            logger.debug("_isRecorder() raised a possibly-allowed exception: %r" % err)
-            return False
+        name = cls._getProductName(info)
+        return name is not None and cls._matchName(name)
 
 
     @classmethod
@@ -533,8 +678,16 @@ class Recorder:
             else:
                 fs = ''
 
-            realpath = os.path.realpath(path)
-            infoFile = os.path.join(realpath, cls._INFO_FILE)
+            realpath = util.realpath(path)
+
+            # Checked first: reading DEVINFO (usually a single `stat()`) is
+            # much cheaper than getting the drive info.
+            if 'info' in kwargs:
+                rawinfo = kwargs['info']
+            else:
+                rawinfo = devinfo._readInfoFile(os.path.join(realpath, cls._INFO_FILE))
+                if rawinfo is None:
+                    return False
 
             if strict:
                 if not fs:
@@ -545,15 +698,7 @@ class Recorder:
                 if "fat" not in fs.lower():
                     return False
 
-            if 'info' in kwargs:
-                devinfo = kwargs['info']
-            elif os.path.isfile(infoFile):
-                with open(infoFile, 'rb') as f:
-                    devinfo = f.read()
-            else:
-                return False
-
-            return cls._isRecorder(devinfo)
+            return cls._isRecorder(rawinfo)
 
         except (KeyError, TypeError, AttributeError, IOError) as err:
             logger.debug("isRecorder() raised a possibly-allowed exception: %r" % err)
@@ -575,49 +720,60 @@ class Recorder:
                 device data. If a `name` is specified, the type returned will
                 vary.
         """
-        mideSchema = loadSchema("mide_ide.xml")
-        with self._busy:
-            if not self._info:
-                if not self._rawinfo:
-                    try:
-                        self._rawinfo = self._getDevinfo().readDevinfo(self.path)
-                    except DeviceError:
-                        # Serial/MQTT _getInfo() command failed
-                        # TODO: This may not be necessary, depending on how remote devices are handled (in progress)
-                        pass
-                if self._rawinfo:
-                    self._hash = hash(self._rawinfo)
-                    infoFile = mideSchema.loads(self._rawinfo)
-                    try:
-                        props = infoFile.dump().get('RecordingProperties', {})
-                        self._info = props.get('RecorderInfo', {})
-                        for k, v in self._info.items():
-                            if isinstance(v, bytes):
-                                # Nothing in the device info should be binary,
-                                # but as of ebmlite 3.0.1, StringElements are
-                                # read as bytes. Convert.
-                                self._info[k] = str(v, 'utf8')
-                    except (IOError, KeyError) as err:
-                        logger.debug("getInfo() raised a possibly-allowed exception: %r" % err)
-                        pass
-                    finally:
-                        infoFile.close()
-
-            if not self._hash:
-                # Probably a virtual device (from IDE file); use _info dict.
-                # FUTURE: base hash on IDE?
-                self._hash = hash(repr(self._info))
-
-            if not self._info:
-                if name is None:
-                    return {}
-                return default
+        # Once read, the info dict is replaced, not modified, so it
+        # can be safely retrieved without acquiring the lock.
+        info = self._info
+        if not info:
+            with self._busy:
+                info = self._info
+                rawinfo = self._rawinfo
+                generation = self._generation
+
+        if not info:
+            # Reading and parsing is done without holding the lock; only
+            # storing the results needs it.
+            if not rawinfo:
+                try:
+                    rawinfo = self._getDevinfo().readDevinfo(self.path)
+                    rawinfo = bytes(rawinfo) if rawinfo else rawinfo
+                except DeviceError:
+                    # Serial/MQTT _getInfo() command failed
+                    # TODO: This may not be necessary, depending on how remote devices are handled (in progress)
+                    pass
+            if rawinfo:
+                try:
+                    # Copied, since the parsed info is shared/cached
+                    info = _parseDevinfo(rawinfo).copy()
+                except (IOError, KeyError) as err:
+                    logger.debug("getInfo() raised a possibly-allowed exception: %r" % err)
+                    pass
+
+            with self._busy:
+                # Don't store anything if `refresh()` was called meanwhile
+                if generation == self._generation:
+                    if self._info:
+                        # Another thread got here first
+                        info = self._info
+                    elif rawinfo:
+                        self._rawinfo = rawinfo
+                        self._hash = hash(rawinfo)
+                        self._info = info
+
+                    if not self._hash:
+                        # Probably a virtual device (from IDE file); use _info dict.
+                        # FUTURE: base hash on IDE?
+                        self._hash = hash(repr(self._info))
 
+        if not info:
             if name is None:
-                # Whole dict requested: return a copy (prevents accidental edits)
-                return self._info.copy()
-            else:
-                return self._info.get(name, default)
+                return {}
+            return default
+
+        if name is None:
+            # Whole dict requested: return a copy (prevents accidental edits)
+            return info.copy()
+        else:
+            return info.get(name, default)
 
 
     @property
@@ -633,7 +789,7 @@ class Recorder:
             return False
         elif not self._path:
             return True
-        return str(self._path).lower().startswith(('mqtt',))
+        return util.isMqttPath(self._path)
 
 
     @property
@@ -682,7 +838,8 @@ class Recorder:
     @property
     def serialInt(self) -> Union[int, None]:
         """ The recorder's manufacturer-issued serial number (as integer). """
-        _ = self.serial  # Calls property, which sets _snInt attribute
+        if self._sn is None:
+            _ = self.serial  # Calls property, which sets _snInt attribute
         return self._snInt
 
 
@@ -702,10 +859,7 @@ class Recorder:
             # Longer IDs (e.g., on STM32) are stored in a UniqueChipIDLong
             # (BinaryElement), big-endian.
             if 'UniqueChipIDLong' in info:
-                chid = 0
-                for b in bytearray(info['UniqueChipIDLong']):
-                    chid = (chid << 8) | b
-                self._chipId = chid
+                self._chipId = int.from_bytes(info['UniqueChipIDLong'], 'big')
             elif 'UniqueChipID' in info:
                 self._chipId = info['UniqueChipID']
             else:
@@ -726,16 +880,9 @@ class Recorder:
             if rev > 99:
                 # New structure of HwRev, which includes version, revision,
                 # and BOM version.
-                major = int(rev/10000)
-                minor = int((rev % 10000) / 100)
-                bom = rev % 100
-                if bom == 0:
-                    bom = ""
-                elif bom < 26:
-                    bom = chr(bom+65)
-                else:
-                    bom = chr((bom % 25) + 64) * int((bom // 25 + 1))
-                rev = f"v{major}r{minor}{bom}"
+                major, minor = divmod(rev, 10000)
+                minor, bom = divmod(minor, 100)
+                rev = f"v{major}r{minor}{_BOM_SUFFIXES[bom]}"
         except TypeError:
             pass
         return str(rev)
@@ -843,8 +990,10 @@ class Recorder:
             return self._channelRanges[key]
 
         xforms = self.getCalPolynomials()
-        lo, hi = subchannel.displayRange
+        hi = subchannel.displayRange[1]
 
+        # HACK: The old parser minimum is slightly low; use negative max.
+        # Since the minimum isn't used, only the maximum gets transformed.
         for xformId in subchannel.getTransforms():
             if isinstance(xformId, Transform):
                 xform = xformId
@@ -853,14 +1002,12 @@ class Recorder:
             else:
                 xform = xforms[xformId]
 
-            lo = xform.function(lo)
             hi = xform.function(hi)
 
-        # HACK: The old parser minimum is slightly low; use negative max.
         lo = -hi
 
         if rounded:
-            lo, hi = (float("%.2f" % lo), float("%.2f" % hi))
+            lo, hi = round(float(lo), 2), round(float(hi), 2)
 
         self._channelRanges[key] = (lo, hi)
 
@@ -884,6 +1031,13 @@ class Recorder:
         channel = 8 if channel is None else channel
         subchannel = 0 if subchannel is None else subchannel
 
+        # Results are cached under both the requested channel and the one
+        # actually used, so a cached result can be found before any work.
+        requested = (channel, subchannel, rounded)
+        cached = self._channelRanges.get(requested)
+        if cached is not None:
+            return cached
+
         channels = self.getChannels(measurement.ACCELERATION)
         xforms = self.getCalPolynomials()
 
@@ -897,12 +1051,13 @@ class Recorder:
                 if chid in channels:
                     channel = chid
                     break
-        if channel is None:
-            channel = list(channels.keys())[0]
+            else:
+                channel = next(iter(channels))
 
-        key = (channel, subchannel)
+        key = (channel, subchannel, rounded)
 
         if key in self._channelRanges:
+            self._channelRanges[requested] = self._channelRanges[key]
             return self._channelRanges[key]
 
         ch = channels[channel]
@@ -919,13 +1074,10 @@ class Recorder:
         sname = sens.name
 
         if 'ADXL' in sname:
-            for name, lo, hi in (('ADXL345', -16, 16),
-                                 ('ADXL355', -8, 8),
-                                 ('ADXL357', -40, 40),
-                                 ('ADXL375', -200, 200)):
+            for name, result in self._ADXL_RANGES.items():
                 if name in sname:
-                    self._channelRanges[key] = (lo, hi)
-                    return lo, hi
+                    self._channelRanges[key] = self._channelRanges[requested] = result
+                    return result
 
         xform = None
         if isinstance(ch.transform, int):
@@ -943,11 +1095,12 @@ class Recorder:
         lo = -hi
 
         if rounded:
-            self._channelRanges[key] = (float("%.2f" % lo), float("%.2f" % hi))
+            result = (round(float(lo), 2), round(float(hi), 2))
         else:
-            self._channelRanges[key] = (lo, hi)
+            result = (lo, hi)
 
-        return self._channelRanges[key]
+        self._channelRanges[key] = self._channelRanges[requested] = result
+        return result
 
 
     def getAccelAxisChannels(self) -> Dict[int, List[SubChannel]]:
@@ -962,10 +1115,31 @@ class Recorder:
         for subCh in self.getSubchannels(measurement.ACCELERATION):
             channels[subCh.parent.id].append(subCh)
 
-        return {chId: sorted(subChs, key=lambda x: x.axisName)
+        return {chId: sorted(subChs, key=attrgetter('axisName'))
                 for chId, subChs in channels.items()}
 
 
+    def _getClockInterface(self, action: str) -> CommandInterface:
+        """ Get the interface used to access the device's clock. Devices
+            without a command interface (e.g., older firmware) use a
+            `FileCommandInterface`, which is created once and reused.
+            Used internally.
+
+            :param action: The clock operation (``"get"`` or ``"set"``),
+                for use in the error message.
+        """
+        if self.isVirtual:
+            raise UnsupportedFeature('Virtual devices do not have clocks')
+        elif self.hasCommandInterface:
+            return self.command
+        elif self.path and os.path.exists(self.path):
+            if self._clockCommand is None:
+                self._clockCommand = command_interfaces.FileCommandInterface(self)
+            return self._clockCommand
+
+        raise UnsupportedFeature(f'Cannot {action} time on device {self}')
+
+
     def getTime(self,
                 epoch=True,
                 timeout: Union[int, float] = 3) -> Union[Tuple[datetime, datetime], Tuple[Epoch, Epoch]]:
@@ -978,15 +1152,7 @@ class Recorder:
                 raising a `TimeoutError`. Not used by older devices/firmware.
             :return: The system time and the device time. Both are UTC.
         """
-        if self.isVirtual:
-            raise UnsupportedFeature('Virtual devices do not have clocks')
-        elif self.hasCommandInterface:
-            ci = self.command
-        elif self.path and os.path.exists(self.path):
-            ci = command_interfaces.FileCommandInterface(self)
-        else:
-            raise UnsupportedFeature(f'Cannot set time on device {self}')
-
+        ci = self._getClockInterface('get')
         return ci.getTime(epoch=epoch, timeout=timeout)
 
 
@@ -1013,15 +1179,7 @@ class Recorder:
                 raising a `TimeoutError`. Not used by older devices/firmware.
             :return: The time that was set, as integer seconds since the epoch.
         """
-        if self.isVirtual:
-            raise UnsupportedFeature('Virtual devices do not have clocks')
-        elif self.hasCommandInterface:
-            ci = self.command
-        elif self.path and os.path.exists(self.path):
-            ci = command_interfaces.FileCommandInterface(self)
-        else:
-            raise UnsupportedFeature(f'Cannot set time on device {self}')
-
+        ci = self._getClockInterface('set')
         return ci.setTime(t=t, pause=pause, retries=retries, timeout=timeout)
 
 
@@ -1042,15 +1200,7 @@ class Recorder:
                 is `True`, before raising a `TimeoutError`.
             :return: The length of the drift, in seconds.
         """
-        if self.isVirtual:
-            raise UnsupportedFeature('Virtual devices do not have clocks')
-        elif self.hasCommandInterface:
-            ci = self.command
-        elif self.path and os.path.exists(self.path):
-            ci = command_interfaces.FileCommandInterface(self)
-        else:
-            raise UnsupportedFeature(f'Cannot get time on device {self}')
-
+        ci = self._getClockInterface('get')
         return ci.getClockDrift(pause=pause, retries=retries, timeout=timeout)
 
 
@@ -1076,12 +1226,17 @@ class Recorder:
         # Note: This method sets `Recorder._propData`, `Recorder._manData`,
         # `Recorder._calData`, `Recorder._manifest`, and `Recorder._calibration`.
 
+        # Fast path: manifest already read. Only reading it needs the lock.
+        manifest = self._manifest
+        if manifest is not None:
+            return manifest
+
         with self._busy:
             if self._manifest is not None or self.isVirtual:
                 return self._manifest
 
-            manSchema = loadSchema('mide_manifest.xml')
-            calSchema = loadSchema('mide_ide.xml')
+            manSchema = _loadSchema('mide_manifest.xml')
+            calSchema = _loadSchema('mide_ide.xml')
             manData, calData, propData = self._getDevinfo().readManifest()
 
             if manData:
@@ -1122,10 +1277,19 @@ class Recorder:
         else:
             caldata = self._getDevinfo().readUserCalibration()
 
-        if caldata:
-            return loadSchema("mide_ide.xml").loads(caldata)
+        if not caldata:
+            return None
+
+        # The device's user calibration is read by both `getUserCalibration()`
+        # and `getUserCalPolynomials()`; parse it only once if unchanged.
+        cached = self._userCalDoc
+        if not filename and cached and cached[0] == caldata:
+            return cached[1]
 
-        return None
+        doc = _loadSchema("mide_ide.xml").loads(caldata)
+        if not filename:
+            self._userCalDoc = (caldata, doc)
+        return doc
 
 
     def getUserCalibration(self,
@@ -1177,7 +1341,8 @@ class Recorder:
             if c is not None:
                 return c
 
-        self.getManifest()
+        if self._calibration is None:
+            self.getManifest()
         return self._calibration
 
 
@@ -1196,9 +1361,10 @@ class Recorder:
             if c is not None:
                 return c
 
-        self.getSensors()
         if self._calPolys is None:
-            self._calPolys = self._parsePolynomials(self._calData)
+            self.getSensors()
+            if self._calPolys is None:
+                self._calPolys = self._parsePolynomials(self._calData)
 
         return self._calPolys
 
@@ -1289,6 +1455,19 @@ class Recorder:
         return self.getCalPolynomials()
 
 
+    def _getPropDoc(self) -> ebmlite.Document:
+        """ Get the parsed recorder property data. Used by both
+            `getSensors()` and `getProperties()`, so it is only parsed once.
+        """
+        cached = self._propDoc
+        if cached and cached[0] is self._propData:
+            return cached[1]
+
+        doc = _loadSchema("mide_ide.xml").loads(self._propData)
+        self._propDoc = (self._propData, doc)
+        return doc
+
+
     def getProperties(self) -> Dict[str, Any]:
         """ Get the raw Recording Properties from the device.
         """
@@ -1296,7 +1475,7 @@ class Recorder:
             return self._properties
 
         self.getManifest()
-        props = loadSchema("mide_ide.xml").loads(self._propData).dump()
+        props = self._getPropDoc().dump()
 
         self._properties = props.get('RecordingProperties', {})
         return self._properties
@@ -1325,7 +1504,7 @@ class Recorder:
                 # Parse userpage recorder property data
                 parser = RecordingPropertiesParser(doc)
                 doc._parsers = {'RecordingProperties': parser}
-                parser.parse(loadSchema("mide_ide.xml").loads(self._propData)[0])
+                parser.parse(self._getPropDoc()[0])
             self._channels = doc.channels
             self._sensors = doc.sensors
             self._warnings = doc.warningRanges
@@ -1366,12 +1545,23 @@ class Recorder:
         """
         # `getSensors()` does all the real work
         self.getSensors()
-        if mtype:
-            channels = measurement.filter_channels(self._channels, mtype)
-            return {ch.id: ch for ch in channels}
-        else:
+        if not mtype:
             return self._channels.copy()
 
+        # Filtered results are cached by query, along with the channel
+        # dictionary they came from (see `getSubchannels()`).
+        cached = self._channelsByMtype
+        if cached is None or cached[0] is not self._channels:
+            cached = self._channelsByMtype = (self._channels, {})
+
+        key = str(mtype)
+        channels = cached[1].get(key)
+        if channels is None:
+            channels = {ch.id: ch for ch in measurement.filter_channels(self._channels, mtype)}
+            cached[1][key] = channels
+
+        return channels.copy()
+
 
     def getSubchannels(self, mtype: Union[MeasurementType, str, None] = None) -> List[SubChannel]:
         """ Get the recorder subchannel description data.
@@ -1382,10 +1572,16 @@ class Recorder:
         """
         # `getSensors()` does all the real work
         self.getSensors()
-        channels = []
-        for ch in self._channels.values():
-            if ch.children:
-                channels.extend(ch.children)
+
+        # All subchannels are cached, along with the channel dictionary they
+        # came from, which gets replaced (not modified) if the data changes.
+        cached = self._allSubchannels
+        if cached is None or cached[0] is not self._channels:
+            subchannels = tuple(chain.from_iterable(ch.children for ch in self._channels.values()
+                                                    if ch.children))
+            cached = self._allSubchannels = (self._channels, subchannels)
+
+        channels = list(cached[1])
         if mtype:
             channels = measurement.filter_channels(channels, mtype)
 
@@ -1411,12 +1607,11 @@ class Recorder:
         if isinstance(transforms, dict):
             transforms = transforms.values()
 
-        data = {}
+        polys = defaultdict(list)
         for xform in transforms:
-            if xform.id is None:
-                continue
-            n = "%sPolynomial" % xform.__class__.__name__
-            data.setdefault(n, []).append(xform.asDict())
+            if xform.id is not None:
+                polys[f"{type(xform).__name__}Polynomial"].append(xform.asDict())
+        data = dict(polys)
 
         if date:
             data['CalibrationDate'] = int(date)
@@ -1425,7 +1620,7 @@ class Recorder:
         if isinstance(calSerial, int):
             data['CalibrationSerialNumber'] = calSerial
 
-        return loadSchema('mide_ide.xml').encodes({'CalibrationList': data})
+        return _loadSchema('mide_ide.xml').encodes({'CalibrationList': data})
 
 
     def writeUserCal(self,
@@ -1483,6 +1678,11 @@ class Recorder:
         """ The device's "configuration interface," the means through which to
             read and/or write device config.
         """
+        # Fast path: interface already found. Only finding it needs the lock.
+        interface = self._config
+        if interface is not None:
+            return interface
+
         with self._busy:
             if self._config is None:
                 for interface in config.INTERFACES:
@@ -1528,21 +1728,22 @@ class Recorder:
         # Crawl the Dataset's EBML document for config-related data.
         # Usually pretty quick.
         for el in dataset.ebmldoc:
-            if el.name.endswith('DataBlock'):
+            name = el.name
+            if name.endswith('DataBlock'):
                 # End of the metadata
                 break
-            elif el.name == 'RecordingProperties':
+            elif name == 'RecordingProperties':
                 rawinfo = el.getRaw()
-            elif el.name.startswith('RecorderConfiguration'):
+            elif name.startswith('RecorderConfiguration'):
                 # This will eventually be unnecessary; see issue:
                 # https://github.com/MideTechnology/idelib/issues/112
                 config = dataset.ebmldoc.schema.loads(el.getRaw())
                 if len(config) > 0 and config[0].name == 'RecorderConfigurationList':
                     config = config[0]
-            elif el.name == 'ConfigUI':
+            elif name == 'ConfigUI':
                 # Proposed, but not yet in IDE files.
                 # No longer strictly required due to `ui_defaults`.
-                configUi = loadSchema('mide_config_ui.xml').loads(el.value)
+                configUi = _loadSchema('mide_config_ui.xml').loads(el.value)
 
         dev = cls(None, virtual=True, devinfo=rawinfo)
         dev._source = dataset
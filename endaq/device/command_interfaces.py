@@ -9,7 +9,6 @@ from datetime import datetime
 import errno
 import os.path
 import shutil
-import string
 import struct
 import sys
 from time import sleep, time, struct_time
@@ -29,6 +28,7 @@ from .hdlc import hdlc_decode, hdlc_encode, HDLC_BREAK_CHAR
 from .exceptions import CRCError
 from .types import Epoch, Filename
 from . import response_codes
+from . import util
 from .response_codes import *
 
 if sys.platform == 'darwin':
@@ -1415,6 +1415,14 @@ class SerialCommandInterface(CommandInterface):
     #  the DEVINFO and should be fetched from it. Default is 128.
     DEFAULT_MAX_COMMAND_SIZE = 128
 
+    # Max age (in seconds) of the cached list of serial ports. Enumerating
+    # the ports is slow on some platforms.
+    PORT_CACHE_TTL = 2.0
+
+    # The cached list of serial ports and the time it was generated. Shared
+    # by all instances and subclasses.
+    _portCache = (0, ())
+
 
     def __init__(self,
                  device: 'Recorder',
@@ -1484,18 +1492,45 @@ class SerialCommandInterface(CommandInterface):
             raise
 
 
+    @classmethod
+    def _listPorts(cls, refresh: bool = False) -> Tuple[tuple, bool]:
+        """ Get all serial ports, as returned by
+            `serial.tools.list_ports.comports()`. The list is cached for
+            `PORT_CACHE_TTL` seconds.
+
+            :param refresh: If `True`, ignore the cached list of ports.
+            :return: A tuple of `ListPortInfo` objects, and `True` if the
+                ports were just listed (i.e., not from the cache).
+        """
+        now = time()
+        then, ports = SerialCommandInterface._portCache
+        if refresh or now - then > cls.PORT_CACHE_TTL:
+            ports = tuple(serial.tools.list_ports.comports())
+            SerialCommandInterface._portCache = (now, ports)
+            return ports, True
+        return ports, False
+
+
     @classmethod
     def _possibleRecorders(cls,
-                           strict: bool = True) -> Generator[Tuple[str, int], None, None]:
+                           strict: bool = True,
+                           refresh: bool = False,
+                           ports: Optional[tuple] = None) -> Generator[Tuple[str, int], None, None]:
         """ Find all serial ports that might be `Recorder` serial command
             interfaces.
 
             :param strict: If `True`, check the USB serial port VID and PID
                 to see if they belong to a known type of device.
+            :param refresh: If `True`, ignore the cached list of ports.
+            :param ports: A previously retrieved list of ports to check
+                (see `_listPorts()`). Overrides `refresh`.
             :yields: Tuples of port name and serial number.
         """
+        if ports is None:
+            ports, _refreshed = cls._listPorts(refresh)
+
         # Find valid USB/serial device by vendor/product ID
-        for port in serial.tools.list_ports.comports():
+        for port in ports:
             sn = port.serial_number
             if not sn or len(sn) != 8:
                continue
@@ -1532,14 +1567,21 @@ class SerialCommandInterface(CommandInterface):
             if isinstance(device, int):
                 devSerial = device
             elif isinstance(device, str):
-                sn = device.lstrip(string.ascii_letters+"0")
-                devSerial = int(sn) if sn else 0
+                devSerial = util.parseSerialNumber(device)
             else:
                 raise
 
-        for port, sn in cls._possibleRecorders(strict=strict):
-            if sn == devSerial:
-                return port
+        # The cached port list may predate the device appearing (e.g., after
+        # a reset); if it isn't found, check again with a fresh list, unless
+        # the list was just retrieved.
+        ports, refreshed = cls._listPorts()
+        while True:
+            for port, sn in cls._possibleRecorders(strict=strict, ports=ports):
+                if sn == devSerial:
+                    return port
+            if refreshed:
+                return None
+            ports, refreshed = cls._listPorts(refresh=True)
 
 
     def getSerialPort(self,
@@ -1592,6 +1634,9 @@ class SerialCommandInterface(CommandInterface):
                     return self.port
 
             except (IOError, serial.SerialException) as err:
+                # The port may have changed; don't use the cached port list
+                SerialCommandInterface._portCache = (0, ())
+
                 # A ClearComError/PermissionError comes up while device resets
                 # (the driver doesn't immediately recognize the device is gone?)
                 # It clears after a couple of seconds; ignore it.
@@ -8,7 +8,9 @@ accessed directly.
 from abc import ABC, abstractmethod
 import logging
 import os.path
+import stat
 import struct
+from time import time
 from typing import Optional, Tuple, Union, TYPE_CHECKING
 
 from .types import Drive, Filename
@@ -21,6 +23,69 @@ if TYPE_CHECKING:
     from .base import Recorder
 
 
+# Recently read DEVINFO file contents, keyed by filename, with the file's
+# stat 'fingerprint' and the time it was read. The fingerprint alone isn't
+# reliable, since identical devices can have identical (or firmware-generated,
+# fixed) file timestamps, so entries are only reused for a short time: a
+# same-size file rewritten within the timestamp resolution is seen at most
+# `DEVINFO_CACHE_TTL` seconds late. All DEVINFO reads (device discovery,
+# `isRecorder()`, `Recorder.getInfo()`, etc.) go through `_readInfoFile()`,
+# so they all follow this policy.
+_DEVINFO_CACHE = {}
+_DEVINFO_CACHE_SIZE = 64
+
+# Max age (in seconds) of cached DEVINFO file contents.
+DEVINFO_CACHE_TTL = 2.0
+
+# Flags for opening DEVINFO files. `O_BINARY` only exists (and is required)
+# on Windows.
+_READ_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+
+def _readInfoFile(infoFile: str) -> Optional[bytes]:
+    """ Read a DEVINFO file, reusing recently-read contents if the file
+        appears unchanged. Used internally.
+
+        :param infoFile: The full path of the DEVINFO file.
+        :return: The contents of the file, or `None` if it does not exist.
+    """
+    try:
+        st = os.stat(infoFile)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+
+    fingerprint = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    now = time()
+    cached = _DEVINFO_CACHE.get(infoFile)
+    if (cached and cached[0] == fingerprint
+            and now - cached[1] < DEVINFO_CACHE_TTL):
+        return cached[2]
+
+    # The file is small and its size is known, so it is read unbuffered,
+    # avoiding the overhead of creating a file object.
+    try:
+        fd = os.open(infoFile, _READ_FLAGS)
+    except FileNotFoundError:
+        # Device removed after the `stat()`
+        return None
+    try:
+        info = b''
+        while True:
+            data = os.read(fd, max(st.st_size - len(info), 0) or 4096)
+            if not data:
+                break
+            info += data
+    finally:
+        os.close(fd)
+
+    if len(_DEVINFO_CACHE) >= _DEVINFO_CACHE_SIZE:
+        _DEVINFO_CACHE.clear()
+    _DEVINFO_CACHE[infoFile] = (fingerprint, now, info)
+    return info
+
+
 # ===========================================================================
 #
 # ===========================================================================
@@ -127,11 +192,8 @@ class FileDeviceInfo(DeviceInfo):
                 previously loaded. For future caching optimization.
         """
         if path and not info:
-            path = os.path.realpath(path.path if isinstance(path, Drive) else path)
-            infoFile = os.path.join(path, cls._INFO_FILE)
-            if os.path.exists(infoFile):
-                with open(infoFile, 'rb') as f:
-                    info = f.read()
+            path = util.realpath(path.path if isinstance(path, Drive) else path)
+            info = _readInfoFile(os.path.join(path, cls._INFO_FILE))
 
         return info
 
@@ -368,7 +430,7 @@ class MQTTDeviceInfo(SerialDeviceInfo):
             return False
 
         # TODO: Better mechanism for identifying MQTT devices
-        return device.path and device.path.lower().startswith('mqtt')
+        return device.path and util.isMqttPath(device.path)
 
 
 # ===========================================================================
@@ -162,9 +162,13 @@ def getDeviceList(types: dict, strict: bool = True) -> list:
         try:
             if not os.path.exists(device):
                 continue
+            # Pass the filesystem type along, so `isRecorder()` doesn't need
+            # to look up the partition again with `getDriveInfo()`.
+            drive = Drive(path=mountpoint, label=None, sn=None, fs=fstype, type=None)
             for t in types:
-                if t.isRecorder(mountpoint, strict=strict):
+                if t.isRecorder(drive, strict=strict):
                     result.add(mountpoint)
+                    break
         except IOError as err:
             # Rare error, may be caused by flaky device or USB.
             msg = ("getDeviceList(): Could not access {} ({}); "
@@ -175,6 +179,13 @@ def getDeviceList(types: dict, strict: bool = True) -> list:
     return sorted(result)
 
 
+def getMountState():
+    """ Get a cheap snapshot of the mounted drives, which can be compared to
+        a previous one to see if anything has been mounted or unmounted.
+    """
+    return tuple(psutil.disk_partitions())
+
+
 # Module-level globals for caching last discovered logical drives and recorders
 _LAST_DEVICES = None  # List of sdiskpart namedtuples from psutils
 _LAST_RECORDERS = None  # tuple of mountpoints of last seen endaq devices
@@ -198,7 +209,7 @@ def deviceChanged(recordersOnly: bool, types: dict, clear: bool = False) -> bool
         _LAST_DEVICES = 0
         _LAST_RECORDERS = None
 
-    newDevices = psutil.disk_partitions()
+    newDevices = getMountState()
     changed = newDevices != _LAST_DEVICES
     _LAST_DEVICES = newDevices
 
@@ -27,9 +27,17 @@ def getDeviceList(types, paths=None):
         for t in types:
             if t.isRecorder(p):
                 result.append(p)
+                break
     return result
 
 
+def getMountState():
+    """ Get a cheap snapshot of the mounted drives, which can be compared to
+        a previous one to see if anything has been mounted or unmounted.
+    """
+    return tuple(os.listdir("/Volumes/"))
+
+
 _LAST_DEVICES = 0
 _LAST_RECORDERS = None
 
@@ -52,7 +60,7 @@ def deviceChanged(recordersOnly, types, clear=False):
         _LAST_DEVICES = 0
         _LAST_RECORDERS = None
     
-    newDevices = os.listdir("/Volumes/")
+    newDevices = getMountState()
     changed = newDevices != _LAST_DEVICES
     _LAST_DEVICES = newDevices
 
@@ -3,9 +3,11 @@ Some basic utility functions, for internal use.
 """
 
 import errno
+from functools import lru_cache
 import os.path
 import pathlib
 import shutil
+import string
 from typing import Any,ByteString, Dict, Union
 
 import logging
@@ -78,3 +80,55 @@ def dump(data: ByteString, length: int = 8) -> str:
     if not length:
         length = len(data)
     return ' '.join(f'{x:02x}' for x in data[:length])
+
+
+@lru_cache(maxsize=256)
+def _cachedRealpath(path: str) -> str:
+    """ Memoized `os.path.realpath()`. Used by `realpath()`. """
+    return os.path.realpath(path)
+
+
+def realpath(path: Union[str, pathlib.Path]) -> Union[str, bytes]:
+    """ A cached version of `os.path.realpath()`, for paths that are checked
+        repeatedly (e.g., when polling for recorders). Only absolute paths
+        are cached, since relative ones depend on the working directory.
+        Note that changes to symbolic links in cached paths will not be
+        reflected; use `realpath.cache_clear()` if that is a concern.
+
+        :param path: The path to resolve.
+        :return: The canonical version of `path`.
+    """
+    path = os.fspath(path)
+    if isinstance(path, str) and os.path.isabs(path):
+        return _cachedRealpath(path)
+    return os.path.realpath(path)
+
+
+realpath.cache_clear = _cachedRealpath.cache_clear
+
+
+# Characters stripped from the start of a serial number string (e.g., the
+# 'S' and zero padding in "S00001234") before converting it to an int.
+_SN_STRIP = string.ascii_letters + "0"
+
+
+@lru_cache(maxsize=256)
+def parseSerialNumber(sn: str) -> int:
+    """ Convert a formatted serial number string (e.g., ``"S00012345"``)
+        to an integer.
+
+        :param sn: The serial number string.
+        :return: The serial number as an integer.
+    """
+    sn = sn.lstrip(_SN_STRIP)
+    return int(sn) if sn else 0
+
+
+def isMqttPath(path: Any) -> bool:
+    """ Does a device path refer to an MQTT (remote) device? Only the
+        prefix is lowercased, rather than the whole path.
+
+        :param path: The device path (typically a string or `None`).
+        :return: `True` if the path starts with ``mqtt`` (case-insensitive).
+    """
+    return path is not None and str(path)[:4].lower() == "mqtt"
@@ -206,6 +206,13 @@ def getDeviceList(types: dict, strict: bool = True) -> List[Drive]:
     return result
 
 
+def getMountState():
+    """ Get a cheap snapshot of the mounted drives, which can be compared to
+        a previous one to see if anything has been mounted or unmounted.
+    """
+    return kernel32.GetLogicalDrives()
+
+
 # Module-level globals for caching last discovered logical drives and recorders
 _LAST_DEVICES = 0       # Bitmap of logical drives (Z...A)
 _LAST_RECORDERS = None  # Tuple of recorder paths (e.g. `["D:\\", "E:\\"]`)
@@ -230,7 +237,7 @@ def deviceChanged(recordersOnly: bool, types: Optional[dict] = None, clear: bool
         _LAST_DEVICES = 0
         _LAST_RECORDERS = None
     
-    newDevices = kernel32.GetLogicalDrives()
+    newDevices = getMountState()
     changed = newDevices != _LAST_DEVICES
     _LAST_DEVICES = newDevices
     
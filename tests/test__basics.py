@@ -2,7 +2,10 @@
 Initial 'sanity check' identification and instantiation tests. Perform early.
 """
 
+from collections import OrderedDict
 import os.path
+import re
+from weakref import WeakValueDictionary
 from glob import glob
 import idelib.importer
 import pytest
@@ -44,6 +47,13 @@ def test_basic_instantiation(path):
     dev = endaq.device.getRecorder(path, strict=False)
     assert dev.path == path
     assert dev.partNumber == os.path.basename(path).partition('_')[0]
+    assert dev.infoFile == os.path.join(path, "SYSTEM", "DEV", "DEVINFO")
+
+    # File paths are updated with the device path
+    dev2 = type(dev)(path, strict=False)
+    assert dev2.configFile == dev.configFile
+    dev2.path = None
+    assert dev2.configFile is None
 
 
 @pytest.mark.parametrize("path", RECORDER_PATHS)
@@ -60,6 +70,213 @@ def test_basic_caching(path):
     assert dev is not dev3
 
 
+@pytest.mark.parametrize("path", RECORDER_PATHS)
+def test_type_dispatch(path, monkeypatch):
+    """ Test that recorder types remembered by product name match the types
+        found by checking every recorder type.
+    """
+    monkeypatch.setattr(endaq.device, '_NAME_MATCHES', {})
+    endaq.device.RECORDERS.clear()
+    dev = endaq.device.getRecorder(path, strict=False)
+    assert endaq.device._NAME_MATCHES
+
+    expected = [t for t in endaq.device.RECORDER_TYPES
+                if t.isRecorder(path, strict=False)][0]
+    assert type(dev) is expected
+
+    endaq.device.RECORDERS.clear()
+    dev2 = endaq.device.getRecorder(path, strict=False)
+    assert type(dev2) is type(dev)
+
+
+def test_probe_cache_swap(tmp_path):
+    """ Test that a different device at the same path is recognized, even if
+        its DEVINFO has the same timestamp.
+    """
+    import shutil
+    first, second = fake_recorders.RECORDER_PATHS[-2:]
+    path = str(tmp_path / "DEV")
+    shutil.copytree(first, path)
+    infoFile = os.path.join(path, "SYSTEM", "DEV", "DEVINFO")
+    stat = os.stat(infoFile)
+
+    dev = endaq.device.getRecorder(path, strict=False)
+    assert dev.partNumber == os.path.basename(first).partition('_')[0]
+
+    shutil.copyfile(os.path.join(second, "SYSTEM", "DEV", "DEVINFO"), infoFile)
+    os.utime(infoFile, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    dev2 = endaq.device.getRecorder(path, strict=False)
+    assert dev2 is not dev
+    assert dev2.serialInt != dev.serialInt
+
+
+def test_probe_drive_info_failure(monkeypatch):
+    """ Test that a path is checked again if its drive info could not be
+        read, but not if its filesystem isn't FAT.
+    """
+    path = fake_recorders.RECORDER_PATHS[-1]
+    drives = [None, endaq.device.Drive(path, None, None, 'vfat', None)]
+    calls = []
+
+    def fakeGetDriveInfo(dev):
+        calls.append(dev)
+        return drives[len(calls) - 1]
+
+    monkeypatch.setattr(endaq.device, '_PROBE_CACHE', OrderedDict())
+    monkeypatch.setattr(endaq.device.os_specific, 'getDriveInfo', fakeGetDriveInfo)
+    assert endaq.device._probePath(path, strict=True) is None
+    assert endaq.device._probePath(path, strict=True) is not None
+    assert len(calls) == 2
+
+    # Definitely not FAT: remembered
+    monkeypatch.setattr(endaq.device, '_PROBE_CACHE', OrderedDict())
+    drives[:] = [endaq.device.Drive(path, None, None, 'ext4', None)]
+    del calls[:]
+    assert endaq.device._probePath(path, strict=True) is None
+    assert endaq.device._probePath(path, strict=True) is None
+    assert len(calls) == 1
+
+
+def test_devinfo_read_cache(tmp_path, monkeypatch):
+    """ Test that recently read DEVINFO is reused only if the file appears
+        unchanged and the cached contents haven't expired.
+    """
+    import shutil
+    first, second = fake_recorders.RECORDER_PATHS[-2:]
+    path = str(tmp_path / "DEV")
+    shutil.copytree(first, path)
+    infoFile = os.path.join(path, "SYSTEM", "DEV", "DEVINFO")
+    stat = os.stat(infoFile)
+    with open(os.path.join(second, "SYSTEM", "DEV", "DEVINFO"), 'rb') as f:
+        secondInfo = f.read()
+
+    readDevinfo = endaq.device.devinfo.FileDeviceInfo.readDevinfo
+    firstInfo = readDevinfo(path)
+    assert readDevinfo(path) is firstInfo
+
+    # Same size and timestamp: contents are reused until they expire
+    with open(infoFile, 'wb') as f:
+        f.write(secondInfo[:stat.st_size].ljust(stat.st_size, b'\x00'))
+    os.utime(infoFile, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert readDevinfo(path) is firstInfo
+
+    monkeypatch.setattr(endaq.device.devinfo, 'DEVINFO_CACHE_TTL', 0)
+    assert readDevinfo(path) != firstInfo
+
+    # Modified file: always reread
+    monkeypatch.undo()
+    shutil.copyfile(os.path.join(second, "SYSTEM", "DEV", "DEVINFO"), infoFile)
+    assert readDevinfo(path) == secondInfo
+
+
+def test_refresh_force(tmp_path):
+    """ Test that a forced refresh rereads DEVINFO, even if the file
+        appears unchanged.
+    """
+    import shutil
+    original = fake_recorders.RECORDER_PATHS[-1]
+    path = str(tmp_path / "DEV")
+    shutil.copytree(original, path)
+    infoFile = os.path.join(path, "SYSTEM", "DEV", "DEVINFO")
+
+    # Not cached; the copy has the same hash as the original
+    rtype = type(endaq.device.getRecorder(original, strict=False))
+    dev = rtype(path, strict=False)
+    name = dev.productName
+    newName = name[:-1] + ('X' if name[-1] != 'X' else 'Y')
+
+    # Same size and timestamp, as with a fixed firmware-generated timestamp
+    stat = os.stat(infoFile)
+    with open(infoFile, 'rb') as f:
+        info = f.read()
+    with open(infoFile, 'wb') as f:
+        f.write(info.replace(name.encode(), newName.encode()))
+    os.utime(infoFile, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    dev.refresh(force=True)
+    assert dev.getInfo('ProductName') == newName
+
+
+@pytest.mark.parametrize("path", RECORDER_PATHS)
+def test_devinfo_parse_cache(path):
+    """ Test that parsed device info is shared between devices, and that
+        changes to one device's info don't affect the others.
+    """
+    endaq.device.RECORDERS.clear()
+    dev = endaq.device.getRecorder(path, strict=False)
+    info = dev.getInfo()
+    dev._info['ProductName'] = "Bogus"
+
+    endaq.device.RECORDERS.clear()
+    endaq.device._RECENT_RECORDERS.clear()
+    dev2 = endaq.device.getRecorder(path, strict=False)
+    assert dev2 is not dev
+    assert dev2.getInfo() == info
+
+
+def test_cache_eviction(monkeypatch):
+    """ Test that the least recently used recorders are the ones no longer
+        kept alive when the cache is full, and that recorders still
+        referenced elsewhere remain cached.
+    """
+    monkeypatch.setattr(endaq.device, 'RECORDER_CACHE_SIZE', 2)
+    endaq.device.RECORDERS.clear()
+    endaq.device._RECENT_RECORDERS.clear()
+
+    paths = fake_recorders.RECORDER_PATHS[:3]
+    devs = [endaq.device.getRecorder(path, strict=False) for path in paths]
+
+    assert len(endaq.device._RECENT_RECORDERS) == 2
+    assert hash(devs[0]) not in endaq.device._RECENT_RECORDERS
+    assert hash(devs[1]) in endaq.device._RECENT_RECORDERS
+    assert hash(devs[2]) in endaq.device._RECENT_RECORDERS
+
+    # Still referenced by `devs`, so not removed from the main cache
+    assert endaq.device.getRecorder(paths[0], strict=False) is devs[0]
+
+
+def test_cache_recency(monkeypatch):
+    """ Test that getting a cached recorder makes it the most recently used,
+        so the newest entries are never the ones evicted.
+    """
+    monkeypatch.setattr(endaq.device, 'RECORDER_CACHE_SIZE', 2)
+    endaq.device.RECORDERS.clear()
+    endaq.device._RECENT_RECORDERS.clear()
+
+    paths = fake_recorders.RECORDER_PATHS[:3]
+    devs = [endaq.device.getRecorder(path, strict=False) for path in paths[:2]]
+
+    # Cache hit on the oldest makes it the newest
+    assert endaq.device.getRecorder(paths[0], strict=False) is devs[0]
+    devs.append(endaq.device.getRecorder(paths[2], strict=False))
+
+    assert list(endaq.device._RECENT_RECORDERS) == [hash(devs[0]), hash(devs[2])]
+
+
+def test_update_uncache(monkeypatch):
+    """ Test that a recorder updated in place is no longer cached (or kept
+        alive) under its old hash.
+    """
+    for name in ('RECORDERS', 'RECORDERS_BY_SN', 'RECORDERS_BY_CHIPID'):
+        monkeypatch.setattr(endaq.device, name, WeakValueDictionary())
+    monkeypatch.setattr(endaq.device, '_RECENT_RECORDERS', OrderedDict())
+
+    first, second = fake_recorders.RECORDER_PATHS[-2:]
+    dev = endaq.device.getRecorder(first, strict=False)
+    other = endaq.device.getRecorder(second, strict=False)
+    oldHash = hash(dev)
+
+    # Simulate the device's DEVINFO having changed
+    monkeypatch.setattr(endaq.device, 'findDevice', lambda **kwargs: other)
+    assert dev.update(strict=False)
+    assert hash(dev) == hash(other)
+
+    assert oldHash not in endaq.device.RECORDERS
+    assert oldHash not in endaq.device._RECENT_RECORDERS
+    assert endaq.device._RECENT_RECORDERS[hash(dev)] is dev
+
+
 def test_getDevices():
     """ Test of `getDevices()`, comparing found device paths to the list of
         fake recorder directories.
@@ -70,12 +287,91 @@ def test_getDevices():
                                    unmounted=False)
     assert sorted(dev.path for dev in devs) == sorted(fake_recorders.RECORDER_PATHS)
 
+    # Duplicate paths should not produce duplicate devices
+    devs = endaq.device.getDevices(paths=fake_recorders.RECORDER_PATHS * 2,
+                                   strict=False,
+                                   unmounted=False)
+    assert len(devs) == len(fake_recorders.RECORDER_PATHS)
+
     # Just one path provided should return just one device
     devs = endaq.device.getDevices(paths=fake_recorders.RECORDER_PATHS[0],
                                    strict=False,
                                    unmounted=False)
     assert len(devs) == 1
 
+    # A `bytearray` path (unhashable) should not cause an error
+    path = bytearray(fake_recorders.RECORDER_PATHS[0].encode())
+    assert isinstance(endaq.device.getDevices(paths=path, strict=False,
+                                              unmounted=False), list)
+
+
+def test_getDevices_probes_once(monkeypatch):
+    """ Test that `getDevices()` probes each path only once per call.
+    """
+    probed = []
+    probePath = endaq.device._probePath
+
+    def countingProbe(path, strict=True):
+        probed.append(path)
+        return probePath(path, strict)
+
+    monkeypatch.setattr(endaq.device, '_probePath', countingProbe)
+    endaq.device.getDevices(paths=fake_recorders.RECORDER_PATHS,
+                            strict=False,
+                            unmounted=False)
+    assert sorted(probed) == sorted(fake_recorders.RECORDER_PATHS)
+
+
+def test_getDevices_reads(monkeypatch):
+    """ Test that `getDevices()` reads each DEVINFO once, and that polling
+        again (with nothing changed) reuses the recently read contents.
+    """
+    opened = []
+    osOpen = os.open
+
+    def countingOpen(path, *args, **kwargs):
+        if os.path.basename(path) == "DEVINFO":
+            opened.append(path)
+        return osOpen(path, *args, **kwargs)
+
+    monkeypatch.setattr(endaq.device.devinfo, '_DEVINFO_CACHE', {})
+    monkeypatch.setattr(endaq.device, '_PROBE_CACHE', OrderedDict())
+    monkeypatch.setattr(os, 'open', countingOpen)
+
+    paths = fake_recorders.RECORDER_PATHS
+    endaq.device.getDevices(paths=paths, strict=False, unmounted=False)
+    assert len(opened) == len(paths)
+
+    del opened[:]
+    endaq.device.getDevices(paths=paths, strict=False, unmounted=False)
+    assert not opened
+
+
+def test_getDeviceList_cache(monkeypatch):
+    """ Test that `getDeviceList()` reuses its previous result if the
+        mounted drives have not changed.
+    """
+    calls = []
+
+    def fakeGetDeviceList(types, strict=True):
+        calls.append(strict)
+        return list(fake_recorders.RECORDER_PATHS)
+
+    monkeypatch.setattr(endaq.device.os_specific, 'getDeviceList', fakeGetDeviceList)
+    monkeypatch.setattr(endaq.device.os_specific, 'getMountState', lambda: 1)
+    monkeypatch.setattr(endaq.device, '_LAST_DEVICE_LIST', (None, 0, ()))
+
+    first = endaq.device.getDeviceList(strict=False)
+    assert endaq.device.getDeviceList(strict=False) == first
+    assert len(calls) == 1
+
+    # Different arguments or different mounted drives get a new list
+    endaq.device.getDeviceList(strict=True)
+    assert len(calls) == 2
+    monkeypatch.setattr(endaq.device.os_specific, 'getMountState', lambda: 2)
+    endaq.device.getDeviceList(strict=True)
+    assert len(calls) == 3
+
 
 @pytest.mark.parametrize("path", RECORDER_PATHS)
 def test_onRecorder(path):
@@ -84,7 +380,11 @@ def test_onRecorder(path):
     """
     endaq.device.RECORDERS.clear()
     dev = endaq.device.getRecorder(path, strict=False)
-    assert endaq.device.onRecorder(dev.infoFile, strict=False)
+    root = endaq.device.onRecorder(dev.infoFile, strict=False)
+    assert root
+
+    # Second time should get the same (cached) result
+    assert endaq.device.onRecorder(dev.infoFile, strict=False) == root
 
 
 @pytest.mark.parametrize("path", RECORDER_PATHS)
@@ -128,6 +428,78 @@ def test_findDevice(path):
                                        strict=False)
 
 
+def test_findDevice_known(monkeypatch):
+    """ Test that known, available devices are found without searching.
+    """
+    path = fake_recorders.RECORDER_PATHS[-1]
+    dev = endaq.device.getRecorder(path, strict=False)
+
+    searches = []
+
+    def fakeGetDevices(*args, **kwargs):
+        searches.append(kwargs)
+        return []
+
+    monkeypatch.setattr(endaq.device, 'getDevices', fakeGetDevices)
+    assert endaq.device.findDevice(dev.serial, strict=False) is dev
+    if dev.chipId:
+        assert endaq.device.findDevice(chipId=dev.chipId, strict=False) is dev
+    assert not searches
+
+    # Device found non-strictly; strict search must look for real devices
+    assert endaq.device.findDevice(dev.serial, strict=True) is None
+    assert len(searches) == 1
+
+
+@pytest.mark.parametrize("path", RECORDER_PATHS)
+def test_accelRange_cache(path):
+    """ Test that cached acceleration ranges are specific to `rounded`.
+    """
+    endaq.device.RECORDERS.clear()
+    endaq.device._RECENT_RECORDERS.clear()
+    dev = endaq.device.getRecorder(path, strict=False)
+    unrounded = dev.getAccelRange(rounded=False)
+    rounded = dev.getAccelRange()
+
+    assert rounded == tuple(round(float(x), 2) for x in unrounded)
+    assert dev.getAccelRange(rounded=False) is unrounded
+    assert dev.getAccelRange() is rounded
+
+
+@pytest.mark.parametrize("path", RECORDER_PATHS)
+def test_getChannels_mtype(path):
+    """ Test that cached, filtered channels match an unfiltered query.
+    """
+    dev = endaq.device.getRecorder(path, strict=False)
+    mtype = endaq.device.measurement.ACCELERATION
+    expected = {ch.id: ch for ch in
+                endaq.device.measurement.filter_channels(dev.channels, mtype)}
+
+    channels = dev.getChannels(mtype)
+    assert channels == expected
+    assert dev.getChannels(str(mtype)) == expected
+
+    # Modifying the results should not change the cached version
+    channels.clear()
+    assert dev.getChannels(mtype) == expected
+
+
+def test_accelRange_adxl_order(monkeypatch):
+    """ Test that digital accelerometer ranges are found in table order,
+        regardless of where the model appears in the sensor name.
+    """
+    path = fake_recorders.RECORDER_PATHS[-1]
+    dev = type(endaq.device.getRecorder(path, strict=False))(path, strict=False)
+    channels = dev.getChannels(endaq.device.measurement.ACCELERATION)
+    channel = next(iter(channels))
+    sensor = channels[channel][0].sensor
+    if isinstance(sensor, int):
+        sensor = dev.sensors[sensor]
+
+    monkeypatch.setattr(sensor, 'name', "ADXL375/ADXL345")
+    assert dev.getAccelRange(channel, 0) == dev._ADXL_RANGES['ADXL345']
+
+
 @pytest.mark.parametrize("filename", IDE_FILES)
 def test_fromRecording(filename):
     """ Test instantiation from an IDE file.
@@ -142,3 +514,88 @@ def test_fromRecording(filename):
     assert dev.channels
     assert dev.sensors
     assert dev.transforms
+
+
+@pytest.mark.parametrize("name", ["S3-E25D40", "W8-R100D40", "SF-DR4-01",
+                                  "SF-DR4-04", "S4-D16", "Slam Stick C",
+                                  "Slam Stick S", "Slam Stick X (100g)",
+                                  "Something Else"])
+def test_name_dispatch(name):
+    """ Test that the combined product name regex picks the same recorder
+        type as checking each type in order.
+    """
+    expected = None
+    for rtype in endaq.device.RECORDER_TYPES:
+        if rtype._matchName(name):
+            expected = rtype
+            break
+
+    assert endaq.device._getTypeByName(name) is expected
+    assert endaq.device._getTypeByName(name.encode('utf8')) is expected
+
+
+@pytest.mark.parametrize("flags,inline", [(re.IGNORECASE, False),
+                                          (re.VERBOSE, False),
+                                          (re.IGNORECASE, True)])
+def test_name_dispatch_flags(flags, inline, monkeypatch):
+    """ Test that each type's regex flags apply when matching names with
+        the combined product name regex (or with each type's own regex,
+        if they can't be combined).
+    """
+    class Flagged(endaq.device.Recorder):
+        _NAME_PATTERN = re.compile(r"E N D", flags | re.IGNORECASE)
+
+    class Other(endaq.device.Recorder):
+        _NAME_PATTERN = re.compile(r"e.*")
+
+    class InlineFlags(endaq.device.Recorder):
+        _NAME_PATTERN = re.compile(r"(?i)X")
+
+    types = [Flagged, Other] + ([InlineFlags] if inline else [])
+    monkeypatch.setattr(endaq.device, 'RECORDER_TYPES', types)
+    monkeypatch.setattr(endaq.device, '_NAME_MATCHES', {})
+
+    for name in ("e n d", "end", "eee", "x"):
+        expected = next((t for t in endaq.device.RECORDER_TYPES
+                         if t._matchName(name)), None)
+        assert endaq.device._getTypeByName(name) is expected
+
+    combinable = flags == re.IGNORECASE and not inline
+    assert (endaq.device._getNameDispatch()[1] is not None) == combinable
+
+
+def test_getSerialDevices(monkeypatch):
+    """ Test finding devices via serial, with the device info retrieval
+        simulated.
+    """
+    paths = fake_recorders.RECORDER_PATHS[-3:]
+    infos = {}
+    for sn, path in enumerate(paths, 1):
+        with open(os.path.join(path, 'SYSTEM', 'DEV', 'DEVINFO'), 'rb') as f:
+            infos[sn] = f.read()
+    infos[len(paths) + 1] = None  # Not a recorder
+
+    def possibleRecorders(strict=True, refresh=False):
+        for sn in infos:
+            yield f"COM{sn}", sn
+
+    monkeypatch.setattr(endaq.device.SerialCommandInterface,
+                        '_possibleRecorders', possibleRecorders)
+    monkeypatch.setattr(endaq.device, '_getSerialInfo', infos.get)
+    monkeypatch.setattr(endaq.device, '_SERIAL_FAILURES', {})
+
+    known = endaq.device.getRecorder(paths[0], strict=False)
+    devs = endaq.device.getSerialDevices(known={1: known})
+
+    assert len(devs) == len(paths)
+    assert devs[0] is known
+    for dev, path in zip(devs[1:], paths[1:]):
+        assert dev.partNumber == os.path.basename(path).partition('_')[0]
+        assert isinstance(dev.command, endaq.device.SerialCommandInterface)
+
+    # The device that failed to respond should not be queried again (yet)
+    queried = []
+    monkeypatch.setattr(endaq.device, '_getSerialInfo',
+                        lambda sn: queried.append(sn) or infos.get(sn))
+    endaq.device.getSerialDevices(known={1: known})
+    assert len(paths) + 1 not in queried
@@ -126,3 +126,37 @@ def test_command_scanWifi(dev):
     response['EBMLResponse']['ResponseIdx'] = dev.command.index + 1
     mock_io.response = mock_io.encodeResponse(response, resultcode=0)
     assert dev.command.scanWifi() == response['EBMLResponse']['WiFiScanResult']['AP']
+
+
+def test_serial_port_cache(monkeypatch):
+    """ Test that the serial port list is cached, and that looking for a
+        device not in the cached list checks again.
+    """
+    from types import SimpleNamespace
+    import serial.tools.list_ports
+
+    ports = [SimpleNamespace(device='COM1', serial_number='00001234',
+                             vid=0x10C4, pid=0x0004)]
+    calls = []
+
+    def comports():
+        calls.append(True)
+        return list(ports)
+
+    monkeypatch.setattr(serial.tools.list_ports, 'comports', comports)
+    monkeypatch.setattr(SerialCommandInterface, '_portCache', (0, ()))
+
+    assert SerialCommandInterface.findSerialPort(1234) == 'COM1'
+    assert SerialCommandInterface.findSerialPort(1234) == 'COM1'
+    assert len(calls) == 1
+
+    # A device not in the cached list causes the ports to be listed again
+    ports.append(SimpleNamespace(device='COM2', serial_number='00005678',
+                                 vid=0x10C4, pid=0x0004))
+    assert SerialCommandInterface.findSerialPort(5678) == 'COM2'
+    assert len(calls) == 2
+
+    # The cache expired: a missing device only causes one listing
+    monkeypatch.setattr(SerialCommandInterface, '_portCache', (0, ()))
+    assert SerialCommandInterface.findSerialPort(9999) is None
+    assert len(calls) == 3